@@ -0,0 +1,1264 @@
+﻿# CJKEnhancedUI.py
+# Version 1.5
+# Customizations and enhancements by Michael M Chen <nvda.conceptsphere@gmail.com>
+# Tested by 蔡宗豪 Victor Cai <surfer0627@gmail.com>
+# A global plug-in intended for the CJK locales
+# Utilizing the character processing framework, several enhancements are implemented for a more user friendly experience.
+# Speech review mode and Braille review mode can be toggled independently with NVDA+0 and NVDA+=(equals) respectively.
+# Summary of the speech review mode
+# Moving the system or review cursor automatically speaks the first character description for non English characters.
+# Pressing numpad2 [or NVDA+.(dot) for laptop] speaks the next character description.
+# Pressing Shift+numPad2 or NVDA+Shift+,(comma) for laptop speaks the previous character description.
+# Typing into the input composition window automatically speaks the first character description for single characters.
+# Summary of the Braille review mode
+# There are three modes: "Off", "On", and "Auto".
+# Braille review mode off: performs default Braille display behavior.
+# Braille review mode on: pressing numpad2 [or nvda+.(dot)] displays the character descriptions.
+# Braille review mode auto: moving the system or review cursor within a region  of text automatically displays the character descriptions.
+# For "On" and "Auto" mode, typing into the input composition window automatically displays character descriptions for single characters.
+# ==========
+# version 1.3
+# Upgrading to compatible with NVDA 2019.3 and Python 3 by Tseng Woody <tsengwoody.tw@gmail.com>
+#####
+# version 1.4
+# Upgrading to compatible with NVDA 2020.1 ('getSpeechForSpelling' rename to 'getSpellingSpeech') by Tseng Woody <tsengwoody.tw@gmail.com>
+# version 1.5
+# Upgrading to compatible with NVDA 2021.1 by Tseng Woody <tsengwoody.tw@gmail.com>
+# version 1.6
+# Upgrading to compatible with NVDA 2022.1 by Tseng Woody <tsengwoody.tw@gmail.com>
+# version 1.7
+# Eliminate outdated code and refactor configuration code.
+# Upgrading to compatible with NVDA 2023.1 by Tseng Woody <tsengwoody.tw@gmail.com>
+# version 1.7.1
+# Fixing the initial config bug
+# version 1.8
+# Upgrading to compatible with NVDA 2023.1 by Tseng Woody <tsengwoody.tw@gmail.com>
+
+
+import time
+_importStartTime = time.perf_counter()
+
+import addonHandler
+import api
+import braille
+from braille import BrailleHandler, TextInfoRegion
+import characterProcessing
+import config
+import controlTypes
+import core
+import inputCore
+import globalPluginHandler
+import keyboardHandler
+from logHandler import log
+import queueHandler
+import scriptHandler
+from scriptHandler import getLastScriptRepeatCount, script
+from speech import getCurrentLanguage, LANGS_WITH_CONJUNCT_CHARS, speech
+from speech.commands import BreakCommand, CallbackCommand, EndUtteranceCommand, LangChangeCommand
+from speech.speech import getCharDescListFromText
+import synthDriverHandler
+import textInfos
+import textInfos.offsets
+import textUtils
+import ui
+
+import functools
+import importlib
+import sys
+from typing import (
+	Callable,
+	Dict,
+	Generator,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from . import (
+	brailleCells,
+	braillePager,
+	charClass,
+	descriptionIndex,
+	instrumentation,
+	phraseTrie,
+	userDescriptions,
+)
+from .linePrefetch import LinePrefetcher
+from .reviewContext import DEFAULT_CONTEXT, DescriptionCursor, getReviewContext, ReviewContext, reviewing
+from .scheduling import Debouncer, LatestOnlyQueue
+from .settings import readSpeechSettings, SettingsSnapshot, SpeechSettings
+
+addonHandler.initTranslation()
+
+ADDON_SUMMARY = addonHandler.getCodeAddon().manifest["summary"]
+
+config.conf.spec["CJKEnhancedUI"] = {
+	"speechReview": "string(default=On)",
+	"brailleReview": "string(default=On)",
+	"spellingChunkSize": "integer(default=200, min=0)",
+	"brailleReviewDelay": "integer(default=100, min=0, max=2000)",
+	"warmUp": "boolean(default=True)",
+	"descriptionStorage": 'option("dict", "compiled", "interned", default="dict")',
+	"phraseReview": "boolean(default=False)",
+	"readings": "boolean(default=False)",
+	"instrumentation": "boolean(default=False)",
+}
+
+#: The pause between the characters of a spelled run, in milliseconds,
+#: close to the pause synthesizers make between utterances.
+SPELLING_BREAK_TIME = 100
+
+#: The state of the Auto braille review, only used from the main thread by the braille hook.
+CJK = {}
+
+#: The position in the description cycle of the character reviewed last.
+descriptionCursor = DescriptionCursor()
+
+#: The braille review page shown last, stepped through by repeating the forward review script.
+braillePageCursor = DescriptionCursor()
+#: The review position the braille review page was shown for last, as (object, offset).
+_braillePagePosition = None
+
+#: The trace recorder, once trace recording was first started. Until then, nothing is recorded.
+_traceRecorder = None
+
+
+def _getLoadedModule(name: str):
+	"""
+	@return: the submodule of the add-on with the given name if it was imported, None otherwise.
+	Rarely used modules are only imported when first needed, so shutting down must not import them.
+	"""
+	return sys.modules.get(f"{__name__}.{name}")
+
+
+def _traceScriptScope(func: Callable) -> Callable:
+	"""
+	Marks the events recorded while the decorated review script runs as nested in it, once trace recording was loaded.
+	"""
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs):
+		if _traceRecorder is None or not _traceRecorder.recording:
+			return func(*args, **kwargs)
+		return _traceRecorder.scriptScope(func)(*args, **kwargs)
+	return wrapper
+
+
+def _invalidateReverseIndex():
+	reverseIndex = _getLoadedModule("reverseIndex")
+	if reverseIndex is not None:
+		reverseIndex.invalidate()
+
+
+def _getReadingStats() -> str:
+	readingIndex = _getLoadedModule("readingIndex")
+	return readingIndex.stats() if readingIndex is not None else "not loaded"
+
+
+#: The implementations the hooks replaced, by hook name.
+_hookOriginals: Dict[str, Callable] = {}
+#: Hooks which were turned off while another add-on had patched over them,
+#: so they stay in place and only call the implementation they replaced.
+_bypassedHooks: Set[str] = set()
+
+#: The add-on's configuration values used by the hot paths, refreshed on profile switches, synth changes and toggles.
+settings = SettingsSnapshot()
+
+
+def _getSpellingSpeechWithoutCharMode(
+		text: str,
+		locale: str,
+		useCharacterDescriptions: bool,
+		sayCapForCapitals: bool,
+		capPitchChange: int,
+		beepForCapitals: bool,
+		fallbackToCharIfNoDescription: bool = True,
+		context: ReviewContext = DEFAULT_CONTEXT,
+		autoLanguageSwitching: bool = True,
+		autoDialectSwitching: bool = True,
+) -> Generator[speech.SequenceItemT, None, None]:
+	"""
+	@param fallbackToCharIfNoDescription: Only applies if useCharacterDescriptions is True.
+	If fallbackToCharIfNoDescription is True, and no character description is found,
+	the character itself will be announced. Otherwise, nothing will be spoken.
+	@param context: why the text is spelled.
+	@param autoLanguageSwitching: the speech setting of the same name, read at the start of the request.
+	@param autoDialectSwitching: the speech setting of the same name, read at the start of the request.
+	"""
+	locale = _getSpellingLocale(locale, autoDialectSwitching)
+	if not text:
+		# Translators: This is spoken when NVDA moves to an empty line.
+		yield _("blank")
+		return
+	end = _getSpellingEnd(text)
+	yield from _getSpellingSpeechForRange(
+		text,
+		0,
+		end,
+		end,
+		locale,
+		useCharacterDescriptions,
+		sayCapForCapitals,
+		capPitchChange,
+		beepForCapitals,
+		autoLanguageSwitching,
+		context,
+	)
+
+
+def _getSpellingLocale(locale: Optional[str], autoDialectSwitching: bool) -> str:
+	defaultLanguage=getCurrentLanguage()
+	if not locale or (not autoDialectSwitching and locale.split('_')[0]==defaultLanguage.split('_')[0]):
+		locale=defaultLanguage
+	return locale
+
+
+def _getSpellingEnd(text: str) -> int:
+	"""
+	@return: the length of the text without trailing white space, or of the whole text if it is only white space.
+	"""
+	end = len(text)
+	if not text.isspace():
+		while text[end-1].isspace():
+			end -= 1
+	return end
+
+
+def _getSpellingSpeechForRange(
+		text: str,
+		start: int,
+		end: int,
+		textLength: int,
+		locale: str,
+		useCharacterDescriptions: bool,
+		sayCapForCapitals: bool,
+		capPitchChange: int,
+		beepForCapitals: bool,
+		autoLanguageSwitching: bool,
+		context: ReviewContext = DEFAULT_CONTEXT,
+) -> Generator[speech.SequenceItemT, None, None]:
+	"""
+	Spells text[start:end], which is part of a spelled text of textLength characters.
+	Consecutive characters which are all described, or all spoken as themselves, are spelled as a run:
+	one utterance starting with a single language change, its characters separated by short breaks.
+	@param context: why the text is spelled.
+	"""
+	speechReview = settings.speechReview
+	#The same command instances are yielded for every run, as they hold no per character state.
+	langChange = LangChangeCommand(locale) if autoLanguageSwitching else None
+	endUtterance = EndUtteranceCommand()
+	characterBreak = BreakCommand(SPELLING_BREAK_TIME)
+	runDescribed: Optional[bool] = None
+	localeHasConjuncts = True if locale.split('_',1)[0] in LANGS_WITH_CONJUNCT_CHARS else False
+	text = text[start:end] if start or end != len(text) else text
+	phrases = None
+	if settings.phraseReview and textLength > 1 and (speechReview == "On" or useCharacterDescriptions):
+		phrases = phraseTrie.getPhraseTrie(locale)
+	if localeHasConjuncts:
+		charDescList = getCharDescListFromText(text,locale)
+	elif phrases is not None:
+		#Describe known phrases as a whole, and the characters between them one at a time.
+		charDescList = phrases.segment(text)
+	else:
+		charDescList = text
+	#Classify the whole text in one pass, rather than each character as it is spelled.
+	classes = b"" if localeHasConjuncts else charClass.classifyText(text)
+	position = 0
+	for item in charDescList:
+		if localeHasConjuncts:
+			# item is a tuple containing character and its description
+			speakCharAs = item[0]
+			charDesc = item[1]
+		elif len(item) > 1:
+			# item is a phrase from the phrase dictionary.
+			speakCharAs = phrases.getDescription(item)[0]
+			charDesc = None
+			position += len(item)
+		else:
+			charDesc = None
+			# item is just a character.
+			speakCharAs = item
+			itemClass = classes[position]
+			position += 1
+			if speechReview == "Off" and useCharacterDescriptions:
+				charDesc = descriptionIndex.getCharacterDescription(locale, speakCharAs.lower())
+			else:
+				#do not speak character descriptions for alphanumeric characters unless the function is called by the review_currentCharacter method.
+				#This is to prevent phonetic spelling of the alphabets when typing, and moving the caret and review cursor.
+				if itemClass == charClass.CharClass.LATIN and not context.isReviewCharacter:
+					#The cursor has moved, so reset the previously stored character.
+					#This allows  for a more consistent speech feedback by always speaking the phonetic spelling of alphanumeric characters first after the focus moves.
+					descriptionCursor.reset()
+				elif speechReview == "On":
+					#Retrieve the character description one at a time.
+					charDesc = speechReview_getCharacterDescription(locale, speakCharAs.lower(), context)
+
+			if charDesc and speechReview == "On":
+				speakCharAs = "".join(charDesc)
+			elif charDesc:
+				IDEOGRAPHIC_COMMA = u"\u3001"
+				speakCharAs=charDesc[0] if textLength>1 else IDEOGRAPHIC_COMMA.join(charDesc)
+			else:
+				speakCharAs = characterProcessing.processSpeechSymbol(locale, speakCharAs)
+
+		uppercase=speakCharAs.isupper()
+		# if useCharacterDescriptions and charDesc:
+			# IDEOGRAPHIC_COMMA = u"\u3001"
+			# speakCharAs=charDesc[0] if textLength>1 else IDEOGRAPHIC_COMMA.join(charDesc)
+		# elif useCharacterDescriptions and not charDesc and not fallbackToCharIfNoDescription:
+			# return None
+		# else:
+			# speakCharAs=characterProcessing.processSpeechSymbol(locale,speakCharAs)
+		described = bool(charDesc) or len(item) > 1 and not localeHasConjuncts
+		if described is runDescribed:
+			yield characterBreak
+		else:
+			if runDescribed is not None:
+				yield endUtterance
+			#Synthesizers start every utterance in their own language, so each run switches language again.
+			if langChange is not None:
+				yield langChange
+			runDescribed = described
+		yield from speech._getSpellingCharAddCapNotification(
+			speakCharAs,
+			uppercase and sayCapForCapitals,
+			capPitchChange if uppercase else 0,
+			uppercase and beepForCapitals,
+		)
+	if runDescribed is not None:
+		yield endUtterance
+
+
+@instrumentation.timed("getSpellingSpeech")
+def custom_getSpellingSpeech(
+		text: str,
+		locale: Optional[str] = None,
+		useCharacterDescriptions: bool = False
+) -> Generator[speech.SequenceItemT, None, None]:
+	if "getSpellingSpeech" in _bypassedHooks:
+		yield from _hookOriginals["getSpellingSpeech"](text, locale, useCharacterDescriptions)
+		return
+	#NVDA calls this without the add-on's arguments, so the review scripts provide their context through the thread's context.
+	context = getReviewContext()
+	if _traceRecorder is not None and _traceRecorder.recording:
+		_traceRecorder.record("spelling", text=text, locale=locale, desc=useCharacterDescriptions)
+	#NVDA's speech settings can change without notifying the add-on, so they are read once per request.
+	speechSettings = readSpeechSettings()
+	chunkSize = settings.spellingChunkSize
+	if chunkSize and len(text) > chunkSize:
+		#Spelling a long text, so resolve its speech lazily a chunk at a time.
+		yield from _SpellingStream(text, locale, useCharacterDescriptions, chunkSize, speechSettings, context).getChunkSpeech()
+		return
+	seq = _getSpellingSpeechWithoutCharMode(
+		text,
+		locale,
+		useCharacterDescriptions,
+		sayCapForCapitals=speechSettings.sayCapForCapitals,
+		capPitchChange=speechSettings.capPitchChange,
+		beepForCapitals=speechSettings.beepForCapitals,
+		context=context,
+		autoLanguageSwitching=speechSettings.autoLanguageSwitching,
+		autoDialectSwitching=speechSettings.autoDialectSwitching,
+	)
+	if speechSettings.useSpellingFunctionality:
+		seq = speech._getSpellingSpeechAddCharMode(seq)
+	yield from seq
+
+
+class _SpellingStream:
+	"""
+	Spells a long text a chunk at a time.
+	The speech for the next chunk is only resolved once the current chunk starts being spoken,
+	so cancelling speech, for example by pressing a key, stops the work along with the speech.
+	"""
+
+	def __init__(
+			self,
+			text: str,
+			locale: Optional[str],
+			useCharacterDescriptions: bool,
+			chunkSize: int,
+			speechSettings: SpeechSettings,
+			context: ReviewContext = DEFAULT_CONTEXT,
+	):
+		self.text = text
+		#Later chunks are spelled from the event queue, outside of the context and the settings of the request.
+		self.context = context
+		self.speechSettings = speechSettings
+		self.locale = _getSpellingLocale(locale, speechSettings.autoDialectSwitching)
+		self.useCharacterDescriptions = useCharacterDescriptions
+		self.chunkSize = chunkSize
+		self.position = 0
+		self.end = _getSpellingEnd(text)
+
+	def _getChunkEnd(self) -> int:
+		chunkEnd = min(self.position+self.chunkSize, self.end)
+		if chunkEnd < self.end and self.locale.split('_',1)[0] in LANGS_WITH_CONJUNCT_CHARS:
+			#Avoid splitting a conjunct between chunks by ending the chunk after white space when possible.
+			spaceIndex = self.text.rfind(" ", self.position, chunkEnd)
+			if spaceIndex > self.position:
+				chunkEnd = spaceIndex+1
+		return chunkEnd
+
+	def getChunkSpeech(self) -> Generator[speech.SequenceItemT, None, None]:
+		"""
+		Spells the next chunk of the text. Unless it is the last one,
+		the speech requests the following chunk once its first character has been spoken,
+		at the break or the end of utterance which follows it.
+		"""
+		start = self.position
+		self.position = self._getChunkEnd()
+		seq = _getSpellingSpeechForRange(
+			self.text,
+			start,
+			self.position,
+			self.end,
+			self.locale,
+			self.useCharacterDescriptions,
+			sayCapForCapitals=self.speechSettings.sayCapForCapitals,
+			capPitchChange=self.speechSettings.capPitchChange,
+			beepForCapitals=self.speechSettings.beepForCapitals,
+			autoLanguageSwitching=self.speechSettings.autoLanguageSwitching,
+			context=self.context,
+		)
+		if self.speechSettings.useSpellingFunctionality:
+			seq = speech._getSpellingSpeechAddCharMode(seq)
+		isLastChunk = self.position >= self.end
+		for item in seq:
+			yield item
+			if not isLastChunk and isinstance(item, (BreakCommand, EndUtteranceCommand)):
+				isLastChunk = True
+				yield CallbackCommand(self._requestNextChunk, name="CJKEnhancedUI.spellNextChunk")
+
+	def _requestNextChunk(self):
+		queueHandler.queueFunction(queueHandler.eventQueue, self._speakNextChunk)
+
+	def _isCanceled(self) -> bool:
+		speechState = getattr(speech, "_speechState", None)
+		return speechState is not None and speechState.beenCanceled
+
+	def _speakNextChunk(self):
+		if self._isCanceled():
+			return
+		seq = list(self.getChunkSpeech())
+		#Speech may have been canceled while the chunk was resolved.
+		if self._isCanceled():
+			return
+		speech.speak(seq)
+
+
+@instrumentation.timed("handlePendingUpdate")
+def customer_handlePendingUpdate(self):
+	"""When any region is pending an update, updates the region and the braille display.
+	"""
+	if "handlePendingUpdate" in _bypassedHooks:
+		return _hookOriginals["handlePendingUpdate"](self)
+	if not self._regionsPendingUpdate:
+		return
+	try:
+		scrollTo: Optional[TextInfoRegion] = None
+		self.mainBuffer.saveWindow()
+		for region in self._regionsPendingUpdate:
+			from treeInterceptorHandler import TreeInterceptor
+			if isinstance(region.obj, TreeInterceptor) and not region.obj.isAlive:
+				log.debug("Skipping region update for died tree interceptor")
+				continue
+			try:
+				region.update()
+			except Exception:
+				log.debugWarning(
+					f"Region update failed for {region}, object probably died",
+					exc_info=True
+				)
+				continue
+			if isinstance(region, TextInfoRegion) and region.pendingCaretUpdate:
+				scrollTo = region
+				region.pendingCaretUpdate = False
+		self.mainBuffer.update()
+		self.mainBuffer.restoreWindow()
+		if scrollTo is not None:
+			self.scrollToCursorOrSelection(scrollTo)
+		if self.buffer is self.mainBuffer:
+			self.update()
+		elif (
+			self.buffer is self.messageBuffer
+			and keyboardHandler.keyCounter > self._keyCountForLastMessage
+		):
+			self._dismissMessage()
+	finally:
+		self._regionsPendingUpdate.clear()
+
+	region = scrollTo if scrollTo else region
+	if _traceRecorder is not None and _traceRecorder.recording:
+		_traceRecorder.record("update", text=region.rawText, pos=region.cursorPos)
+	if settings.brailleReview != "Auto":
+		#Nothing to compare against once Auto mode is turned on again.
+		CJK["previousRegionFingerprint"] = None
+	else:
+		fingerprint = getRegionFingerprint(region)
+		if CJK["previousRegionFingerprint"] == fingerprint and CJK["previousCursorPos"] != region.cursorPos:
+			#The cursor is inside the raw text of the previous region and its position as moved, so display the character descriptions.
+			i = region.cursorPos
+			char = region.rawText[int(_(i or 0))]
+			showAutoBrailleReview(descriptionIndex.getReviewRecord(settings.locale, char))
+		else:
+			autoBrailleReviewDebouncer.cancel()
+			#This region has a new raw text, so store its fingerprint for subsequent comparison.
+			CJK["previousRegionFingerprint"] = fingerprint
+	CJK["previousCursorPos"] = region.cursorPos
+
+
+def showBrailleReviewPage(record, direction=0):
+	"""
+	Shows a page of the braille description of a character, split on description boundaries to fit the display.
+	@param record: the review record of the character.
+	@type record: descriptionIndex.ReviewRecord
+	@param direction: 1 to show the page after the one shown last when it was of the same character at the same position,
+		0 to show the first page.
+	@type direction: int
+	"""
+	global _braillePagePosition
+	pages = braillePager.getPages(settings.locale, record)
+	if not pages:
+		return
+	#The caret or the review cursor may have moved without a review script, for example to the same character elsewhere,
+	#so the pages start over whenever the reviewed position changes, as the spoken descriptions do.
+	position = _getReviewedPosition()
+	if position != _braillePagePosition:
+		_braillePagePosition = position
+		braillePageCursor.reset()
+	_startedOver, page = braillePageCursor.step(record.character, direction, len(pages))
+	brailleCells.showMessage(pages[page])
+
+
+#: Shows automatic braille review descriptions once the cursor has settled, dropping those of characters only passed over.
+autoBrailleReviewDebouncer = Debouncer(showBrailleReviewPage)
+
+
+def showAutoBrailleReview(record):
+	"""
+	Schedules the braille description of a character the cursor moved to in Auto braille review mode.
+	The first page of the description is shown after the configured delay, unless the cursor moves again before that.
+	@param record: the review record of the character.
+	@type record: descriptionIndex.ReviewRecord
+	"""
+	if record.brailleMessage:
+		autoBrailleReviewDebouncer.schedule(record, settings.brailleReviewDelay)
+	else:
+		autoBrailleReviewDebouncer.cancel()
+
+
+#: The number of characters taken from each end of the raw text of a braille region for its fingerprint.
+FINGERPRINT_EDGE_LENGTH = 32
+
+
+def getRegionFingerprint(region):
+	"""
+	Identifies the raw text of a braille region without keeping the text alive.
+	The region rebuilds its raw text on every update, so hashing or comparing the whole text would cost
+	as much as the line is long. Only the identity of the region, the length of the text and its first and last
+	characters are taken, which costs the same whatever the length of the line.
+	Two lines of the same length with the same characters at both ends are taken for the same line.
+	@return: the identity of the region, the length of its raw text and the characters at both ends of it.
+	@rtype: tuple
+	"""
+	rawText = region.rawText
+	return (id(region), len(rawText), rawText[:FINGERPRINT_EDGE_LENGTH], rawText[-FINGERPRINT_EDGE_LENGTH:])
+
+
+#: Holds the pending announcement of input composition updates.
+compositionAnnouncementQueue = LatestOnlyQueue(queueHandler.eventQueue)
+
+
+@instrumentation.timed("reportNewText")
+def custom_reportNewText(self,oldString,newString):
+	if "reportNewText" in _bypassedHooks:
+		return _hookOriginals["reportNewText"](self, oldString, newString)
+	if _traceRecorder is not None and _traceRecorder.recording:
+		_traceRecorder.record("composition", old=oldString, new=newString)
+	if (config.conf["keyboard"]["speakTypedCharacters"] or config.conf["keyboard"]["speakTypedWords"]):
+		from NVDAObjects.inputComposition import calculateInsertedChars
+		newText=calculateInsertedChars(oldString.strip(u'\u3000'),newString.strip(u'\u3000'))
+		newSpeechText = None
+		newBrailleText = None
+		if settings.speechReview == "On" and charClass.shouldDescribe(newText) and len(newText) == 1:
+			try:
+				newSpeechText = speechReview_getCharacterDescription(settings.locale, newText)
+			except TypeError:
+				pass
+		if settings.isBrailleReviewEnabled and charClass.shouldDescribe(newText) and len(newText) == 1:
+			newBrailleText = descriptionIndex.getReviewRecord(settings.locale, newText).brailleMessage
+		#Only the announcement of the latest composition update is kept, so bursts of updates do not pile up stale ones.
+		if newSpeechText or newText:
+			compositionAnnouncementQueue.queueFunction(_announceComposition, newText, newSpeechText, newBrailleText)
+
+
+def _announceComposition(newText, newSpeechText, newBrailleText):
+	if newSpeechText:
+		ui.reviewMessage(newSpeechText)
+	else:
+		speech.speakText(newText,symbolLevel=characterProcessing.SymbolLevel.ALL)
+	if newBrailleText:
+		brailleCells.showMessage(newBrailleText)
+
+
+@instrumentation.timed("speechReview_getCharacterDescription")
+def speechReview_getCharacterDescription(locale, character, context=DEFAULT_CONTEXT):
+	"""
+	This function is derived from the default getCharacterDescription function specifically to handle the speechreview mode behavior.
+	@param locale: the locale (language[_COUNTRY]) the description should be for.
+	@type locale: string
+	@param character: the character  who's description should be retrieved.
+	@type character: string
+	@param context: why the character is spelled, which gives the direction in which to enumerate its descriptions.
+	@type context: L{ReviewContext}
+	@return:  the found description for the given character. if speech/Braille review mode is turned on, one description is returned at a time.
+	@rtype: string
+	"""
+	#The index already merges the descriptions of the locale, its language and English,
+	#and the record is cached, so reviewing a character again costs a single cache probe.
+	record = descriptionIndex.getReviewRecord(locale, character)
+
+	if settings.speechReview == "Off":
+	#Perform default behavior.
+		return record.descriptions or None
+	if not record.descriptions:
+		#There is no description for the character, so return nothing to allow the character to be passed to the processSymbol function.
+		#Allows for speaking of punctuation and symbols absent from the dictionary.
+		return None
+
+	#The description cycle ends with the decimal and hexadecimal representation of the character.
+	desc = record.descriptionCycle
+	#Determine the list position for the next character description.
+	#When the caret or review cursor has moved, the cursor starts over at the first description of the new character.
+	startedOver, descIndex = descriptionCursor.step(character, context.direction, len(desc))
+	if startedOver and charClass.shouldDescribe(character):
+		#Allow speaking the character alone followed by a pause before the first description.
+		#This could be desirable when the user wants to quickly move through a sentence without hearing extra information.
+		return record.firstSpeechText
+	return " "+desc[descIndex]
+
+
+#: The review records of the line the review cursor is in, for the review scripts.
+linePrefetcher = LinePrefetcher()
+
+
+def _getOffsets(info) -> Optional[textInfos.offsets.Offsets]:
+	"""
+	@return: the offsets of a text info in its text, or None for text infos which are not offset based
+		or whose offsets are neither characters nor UTF-16 code units.
+	"""
+	try:
+		bookmark = info.bookmark
+	except (AttributeError, NotImplementedError):
+		return None
+	if not isinstance(bookmark, textInfos.offsets.Offsets):
+		return None
+	if getattr(info, "encoding", None) not in (None, textUtils.WCHAR_ENCODING):
+		return None
+	return bookmark
+
+
+def _getStartOffset(info) -> Optional[int]:
+	"""
+	@return: the offset of the start of a text info in its text, or None if it has no usable offsets.
+	"""
+	offsets = _getOffsets(info)
+	return offsets.startOffset if offsets is not None else None
+
+
+def _getReviewedPosition():
+	"""
+	@return: the object and offset of the review position, or None when the review position is not offset based.
+	"""
+	try:
+		info = api.getReviewPosition()
+	except (NotImplementedError, RuntimeError):
+		return None
+	offset = _getStartOffset(info)
+	return (info.obj, offset) if offset is not None else None
+
+
+def _prefetchLine(lineInfo, info):
+	"""
+	Prefetches the review records of a line around the review position info.
+	The text of the line is only fetched when the review cursor entered another line.
+	"""
+	if settings.speechReview == "On" or settings.brailleReview == "Auto":
+		lineOffsets = _getOffsets(lineInfo)
+		if lineOffsets is None:
+			return
+		linePrefetcher.enterLine(
+			lineInfo.obj,
+			lineOffsets.startOffset,
+			lineOffsets.endOffset,
+			lambda: lineInfo.text,
+			settings.locale,
+			offset=_getStartOffset(info),
+			wideOffsets=getattr(lineInfo, "encoding", None) == textUtils.WCHAR_ENCODING,
+		)
+
+
+def _recordScript(name, info, lineInfo=None):
+	"""
+	Records a review script being run and the text it reviews.
+	"""
+	fields = {"name": name, "text": info.text}
+	if lineInfo is not None:
+		start = _getStartOffset(info)
+		lineStart = _getStartOffset(lineInfo)
+		fields["line"] = lineInfo.text
+		fields["offset"] = start-lineStart if start is not None and lineStart is not None else None
+	_traceRecorder.record("script", **fields)
+
+
+#: How often the user's description files are checked for changes, in milliseconds.
+USER_DESCRIPTIONS_WATCH_INTERVAL = 2000
+
+
+def reloadUserDescriptions():
+	"""
+	Applies the changes made to the user's description files since they were read.
+	Only the review records of the changed characters are discarded; the description indexes are kept.
+	@return: the number of changed entries.
+	@rtype: int
+	"""
+	changes = userDescriptions.reload()
+	for locale, characters in changes.items():
+		descriptionIndex.evictCharacters(locale, characters)
+	if changes:
+		#These are rebuilt lazily and cheaply, so they are dropped rather than patched.
+		linePrefetcher.clear()
+		braillePager.invalidate()
+		_invalidateReverseIndex()
+	return sum(map(len, changes.values()))
+
+
+def reportCharacterSearch(query):
+	"""
+	Presents the characters whose descriptions contain the query, best matches first, in a browseable message.
+	The first search of a locale waits for its reverse index to be built in the background.
+	"""
+	from . import reverseIndex
+	index = reverseIndex.getBuiltReverseIndex(settings.locale)
+	if index is None:
+		# Translators: Reported when a search by description waits for the descriptions to be indexed.
+		ui.message(_("Indexing character descriptions"))
+		reverseIndex.warmUp(
+			settings.locale,
+			lambda: queueHandler.queueFunction(queueHandler.eventQueue, reportCharacterSearch, query),
+		)
+		return
+	matches = index.search(query)
+	if not matches:
+		# Translators: Reported when no character description contains the searched text.
+		ui.message(_("No character found for %s")%query)
+		return
+	ui.browseableMessage(
+		"\n".join(match.character+" "+" ".join(match.descriptions) for match in matches),
+		# Translators: The title of the list of characters found by description.
+		_("Characters described by %s")%query,
+	)
+
+
+def _isWindowsLockedFor(obj):
+	"""
+	Checks whether an object must not be announced because it is below the lock screen.
+	utils.security is only imported by the review scripts, when first needed.
+	"""
+	from utils.security import objectBelowLockScreenAndWindowsIsLocked
+	return objectBelowLockScreenAndWindowsIsLocked(obj)
+
+
+def _reportWindowsLocked():
+	import gui
+	ui.reviewMessage(gui.blockAction.Context.WINDOWS_LOCKED.translatedMessage)
+
+
+def _getInputCompositionClass():
+	return importlib.import_module("NVDAObjects.inputComposition").InputComposition
+
+
+#: The functions patched by the add-on, by name: a function returning the patched object, the patched attribute and its replacement.
+#: Objects are only fetched, and their modules imported, when the patch is first installed.
+HOOKS: Dict[str, Tuple[Callable[[], object], str, Callable]] = {
+	"getSpellingSpeech": (lambda: speech, "getSpellingSpeech", custom_getSpellingSpeech),
+	"handlePendingUpdate": (lambda: BrailleHandler, "_handlePendingUpdate", customer_handlePendingUpdate),
+	"reportNewText": (_getInputCompositionClass, "reportNewText", custom_reportNewText),
+}
+
+
+class GlobalPlugin(globalPluginHandler.GlobalPlugin):
+	def __init__(self):
+		initStartTime = time.perf_counter()
+		super().__init__()
+		settings.refresh()
+		descriptionIndex.setStorage(config.conf["CJKEnhancedUI"]["descriptionStorage"])
+		descriptionIndex.setReadings(config.conf["CJKEnhancedUI"]["readings"])
+		if config.conf["CJKEnhancedUI"]["warmUp"]:
+			#Load the descriptions of NVDA's locale and of the speech language in the background,
+			#rather than on the first reviewed or composed character.
+			descriptionIndex.warmUp([settings.locale, getCurrentLanguage()])
+		descriptionCursor.reset()
+		braillePageCursor.reset()
+		CJK["previousRegionFingerprint"] = None	#Stores the fingerprint of the raw text of the Braille region before the last cursor move.
+		CJK["previousCursorPos"] = -1	#Stores the position of the cursor before the last cursor move.
+
+		instrumentation.enabled = config.conf["CJKEnhancedUI"]["instrumentation"]
+		self._installedHooks = set()
+		self.syncHooks()
+
+		config.post_configProfileSwitch.register(self.handleConfigChange)
+		config.post_configReset.register(self.handleConfigChange)
+		config.post_configSave.register(self.handleConfigChange)
+		synthDriverHandler.synthChanged.register(self.handleConfigChange)
+		braille.displayChanged.register(brailleCells.invalidate)
+		braille.displayChanged.register(braillePager.invalidate)
+		self._userDescriptionsTimer = core.callLater(USER_DESCRIPTIONS_WATCH_INTERVAL, self._watchUserDescriptions)
+
+		log.info(
+			f"CJKEnhancedUI loaded: import {(_importEndTime - _importStartTime) * 1000:.1f} ms,"
+			f" init {(time.perf_counter() - initStartTime) * 1000:.1f} ms,"
+			f" hooks installed: {', '.join(sorted(self._installedHooks)) or 'none'}"
+		)
+
+	def handleConfigChange(self):
+		locale = settings.locale
+		settings.refresh()
+		if locale != settings.locale:
+			#NVDA's language has changed, so the description indexes must be rebuilt for the new locale.
+			descriptionIndex.invalidate()
+			phraseTrie.invalidate()
+			_invalidateReverseIndex()
+			linePrefetcher.clear()
+		descriptionIndex.setStorage(config.conf["CJKEnhancedUI"]["descriptionStorage"])
+		if descriptionIndex.setReadings(config.conf["CJKEnhancedUI"]["readings"]):
+			linePrefetcher.clear()
+		#The braille settings of the new profile may translate differently.
+		brailleCells.invalidate()
+		braillePager.invalidate()
+		self.syncHooks()
+
+	def _watchUserDescriptions(self):
+		"""
+		Applies the changes of the user's description files, and checks them again after an interval.
+		"""
+		try:
+			reloadUserDescriptions()
+		except Exception:
+			log.error("Failed to reload user character descriptions", exc_info=True)
+		self._userDescriptionsTimer = core.callLater(USER_DESCRIPTIONS_WATCH_INTERVAL, self._watchUserDescriptions)
+
+	def syncHooks(self):
+		"""
+		Installs each patch only while a review mode needs it, and restores NVDA's implementation otherwise.
+		"""
+		speechReviewOn = settings.speechReview == "On"
+		self._setHookInstalled("getSpellingSpeech", speechReviewOn)
+		#Only Auto mode reacts to braille region updates.
+		self._setHookInstalled("handlePendingUpdate", settings.brailleReview == "Auto")
+		self._setHookInstalled("reportNewText", speechReviewOn or settings.isBrailleReviewEnabled)
+
+	def _setHookInstalled(self, name, install):
+		if install == (name in self._installedHooks):
+			return
+		getOwner, attribute, replacement = HOOKS[name]
+		owner = getOwner()
+		if install:
+			if name == "handlePendingUpdate":
+				#The state recorded before the hook was last removed is stale,
+				#so the first update after installing it must not be taken for a cursor move.
+				CJK["previousRegionFingerprint"] = None
+				CJK["previousCursorPos"] = -1
+			if name in _bypassedHooks:
+				#The hook was left in place under another add-on's patch, so it only has to act again.
+				_bypassedHooks.discard(name)
+			else:
+				#Keep NVDA's implementation, for restoring it and for measuring against it.
+				_hookOriginals[name] = getattr(owner, attribute)
+				setattr(owner, attribute, replacement)
+			setattr(self, "default_"+name, _hookOriginals[name])
+			self._installedHooks.add(name)
+		else:
+			if getattr(owner, attribute) is replacement:
+				setattr(owner, attribute, _hookOriginals[name])
+			else:
+				#Another add-on patched over the hook and calls it, so restoring the original would remove that patch.
+				log.debug(f"CJKEnhancedUI {name} hook was patched over, leaving it in place as a pass through")
+				_bypassedHooks.add(name)
+			self._installedHooks.discard(name)
+
+	@script(
+		gestures=["kb:nvda+0"],
+		description=_("Toggle on or off the CJK enhanced UI speech review mode."),
+		category=ADDON_SUMMARY,
+	)
+	def script_ToggleSpeechReview(self,gesture):
+		if config.conf["CJKEnhancedUI"]["speechReview"] == "Off":
+			config.conf["CJKEnhancedUI"]["speechReview"] = "On"
+			ui.message(_("Speech review mode %s")%_("On"))
+		else:
+			config.conf["CJKEnhancedUI"]["speechReview"] = "Off"
+			ui.message(_("Speech review mode %s")%_("Off"))
+		settings.refresh()
+		self.syncHooks()
+
+	@script(
+		gestures=["kb:nvda+="],
+		description=_("Toggle the Braille review mode between Review, Auto, and Off."),
+		category=ADDON_SUMMARY,
+	)
+	def script_ToggleBrailleReview(self,gesture):
+		if config.conf["CJKEnhancedUI"]["brailleReview"] == "Off":
+			config.conf["CJKEnhancedUI"]["brailleReview"] = "On"
+			ui.message(_("Braille review mode %s")%_("On"))
+		elif config.conf["CJKEnhancedUI"]["brailleReview"] == "On":
+			config.conf["CJKEnhancedUI"]["brailleReview"] = "Auto"
+			ui.message(_("Braille review mode %s")%_("Auto"))
+		else:
+			config.conf["CJKEnhancedUI"]["brailleReview"] = "Off"
+			ui.message(_("Braille review mode %s")%_("Off"))
+		settings.refresh()
+		self.syncHooks()
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the toggle character readings command.
+			"Toggles on or off the Zhuyin or Pinyin readings in the list of character descriptions."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_toggleReadings(self, gesture):
+		enabled = not config.conf["CJKEnhancedUI"]["readings"]
+		config.conf["CJKEnhancedUI"]["readings"] = enabled
+		# Translators: Reported when the character readings are toggled, followed by On or Off.
+		ui.message(_("Character readings %s")%(_("On") if enabled else _("Off")))
+		self.handleConfigChange()
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the toggle phrase review command.
+			"Toggles on or off describing known phrases as a whole when text is spelled."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_togglePhraseReview(self, gesture):
+		enabled = not config.conf["CJKEnhancedUI"]["phraseReview"]
+		config.conf["CJKEnhancedUI"]["phraseReview"] = enabled
+		# Translators: Reported when the phrase review is toggled, followed by On or Off.
+		ui.message(_("Phrase review %s")%(_("On") if enabled else _("Off")))
+		self.handleConfigChange()
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for move review cursor to previous character command.
+			"Moves the review cursor to the previous character of the current navigator object and speaks it"
+		),
+		category=ADDON_SUMMARY,
+		gestures=("kb:numpad1", "kb(laptop):NVDA+leftArrow", "ts(text):flickLeft")
+	)
+	@instrumentation.timed("script_review_previousCharacter")
+	@_traceScriptScope
+	def script_review_previousCharacter(self, gesture: inputCore.InputGesture):
+		lineInfo=api.getReviewPosition().copy()
+		lineInfo.expand(textInfos.UNIT_LINE)
+		charInfo=api.getReviewPosition().copy()
+		charInfo.expand(textInfos.UNIT_CHARACTER)
+		charInfo.collapse()
+		res=charInfo.move(textInfos.UNIT_CHARACTER,-1)
+		if res==0 or charInfo.compareEndPoints(lineInfo,"startToStart")<0:
+			# Translators: a message reported when review cursor is at the leftmost character of the current navigator object's text.
+			ui.reviewMessage(_("Left"))
+			reviewInfo = api.getReviewPosition().copy()
+		else:
+			reviewInfo = charInfo
+			api.setReviewPosition(reviewInfo)
+
+		# This script is available on the lock screen via getSafeScripts, as such
+		# ensure the review position does not contain secure information
+		# before announcing this object
+		if _isWindowsLockedFor(reviewInfo.obj):
+			_reportWindowsLocked()
+			return
+		else:
+			reviewInfo.expand(textInfos.UNIT_CHARACTER)
+			if _traceRecorder is not None and _traceRecorder.recording:
+				_recordScript("review_previousCharacter", reviewInfo, lineInfo)
+			speech.speakTextInfo(
+				reviewInfo,
+				unit=textInfos.UNIT_CHARACTER,
+				reason=controlTypes.OutputReason.CARET
+			)
+
+			#Add character description Braille output to the review character when Braille review mode is set to "Auto".
+			braillePageCursor.reset()
+			char = reviewInfo.text.lower()
+			if charClass.shouldDescribe(char) and settings.brailleReview == "Auto":
+				showAutoBrailleReview(linePrefetcher.getRecord(_getStartOffset(reviewInfo), char, settings.locale))
+			else:
+				autoBrailleReviewDebouncer.cancel()
+			_prefetchLine(lineInfo, reviewInfo)
+
+	@script(
+		gestures=["kb:numPad3", "kb(laptop):nvda+rightarrow"],
+		description=_("Moves the review cursor to the next character of the current navigator object and speaks it"),
+		category=ADDON_SUMMARY,
+	)
+	@instrumentation.timed("script_review_nextCharacter")
+	@_traceScriptScope
+	def script_review_nextCharacter(self, gesture: inputCore.InputGesture):
+		lineInfo=api.getReviewPosition().copy()
+		lineInfo.expand(textInfos.UNIT_LINE)
+		charInfo=api.getReviewPosition().copy()
+		charInfo.expand(textInfos.UNIT_CHARACTER)
+		charInfo.collapse()
+		res=charInfo.move(textInfos.UNIT_CHARACTER,1)
+		if res==0 or charInfo.compareEndPoints(lineInfo,"endToEnd")>=0:
+			# Translators: a message reported when review cursor is at the rightmost character of the current navigator object's text.
+			ui.reviewMessage(_("Right"))
+			reviewInfo = api.getReviewPosition().copy()
+		else:
+			reviewInfo = charInfo
+			api.setReviewPosition(reviewInfo)
+
+		# This script is available on the lock screen via getSafeScripts, as such
+		# ensure the review position does not contain secure information
+		# before announcing this object
+		if _isWindowsLockedFor(reviewInfo.obj):
+			_reportWindowsLocked()
+			return
+		else:
+			reviewInfo.expand(textInfos.UNIT_CHARACTER)
+			if _traceRecorder is not None and _traceRecorder.recording:
+				_recordScript("review_nextCharacter", reviewInfo, lineInfo)
+			speech.speakTextInfo(
+				reviewInfo,
+				unit=textInfos.UNIT_CHARACTER,
+				reason=controlTypes.OutputReason.CARET
+			)
+
+			#Add character description Braille output to the review character when Braille review mode is set to "Auto".
+			braillePageCursor.reset()
+			char = reviewInfo.text.lower()
+			if charClass.shouldDescribe(char) and settings.brailleReview == "Auto":
+				showAutoBrailleReview(linePrefetcher.getRecord(_getStartOffset(reviewInfo), char, settings.locale))
+			else:
+				autoBrailleReviewDebouncer.cancel()
+			_prefetchLine(lineInfo, reviewInfo)
+
+	@script(
+		gestures=["kb:numPad2", "kb(laptop):NVDA+."],
+		description=_("Enumerates in forward order through the list of character descriptions in the dictionary."),
+		category=ADDON_SUMMARY,
+	)
+	@instrumentation.timed("script_forward_review_currentCharacter")
+	@_traceScriptScope
+	def script_forward_review_currentCharacter(self,gesture):
+		info=api.getReviewPosition().copy()
+		# This script is available on the lock screen via getSafeScripts, as such
+		# ensure the review position does not contain secure information
+		# before announcing this object
+		if _isWindowsLockedFor(info.obj):
+			_reportWindowsLocked()
+			return
+
+		info.expand(textInfos.UNIT_CHARACTER)
+		if _traceRecorder is not None and _traceRecorder.recording:
+			_recordScript("forward_review_currentCharacter", info)
+		# Explicitly tether here
+		braille.handler.handleReviewMove(shouldAutoTether=True)
+		scriptCount=scriptHandler.getLastScriptRepeatCount()
+
+		if settings.isBrailleReviewEnabled:
+			#The description is requested explicitly, so it replaces any pending automatic one and is shown at once.
+			autoBrailleReviewDebouncer.cancel()
+			char = info.text.lower()
+			record = linePrefetcher.getRecord(_getStartOffset(info), char, settings.locale)
+			#Repeated presses step through the pages of a description too long for the display.
+			showBrailleReviewPage(record, direction=1)
+
+		if settings.speechReview == "On":
+			with reviewing(direction=1):
+				speech.spellTextInfo(info,useCharacterDescriptions=True)
+		else:
+			if scriptCount==0:
+				speech.speakTextInfo(info, unit=textInfos.UNIT_CHARACTER, reason=controlTypes.OutputReason.CARET)
+			elif scriptCount==1:
+				speech.spellTextInfo(info,useCharacterDescriptions=True)
+			else:
+				try:
+					c = ord(info.text)
+				except TypeError:
+					c = None
+				if c is not None:
+					speech.speakMessage("%d," % c)
+					speech.speakSpelling(hex(c))
+					if not settings.isBrailleReviewEnabled:
+						braille.handler.message(f"{c}, {hex(c)}")
+				else:
+					log.debugWarning("Couldn't calculate ordinal for character %r" % info.text)
+					speech.speakTextInfo(info, unit=textInfos.UNIT_CHARACTER, reason=controlTypes.OutputReason.CARET)
+
+	@script(
+		gestures=["kb:Shift+numPad2", "kb(laptop):NVDA+Shift+."],
+		description=_("Enumerates in reverse order through the list of character descriptions in the dictionary."),
+		category=ADDON_SUMMARY,
+	)
+	@instrumentation.timed("script_reverse_review_currentCharacter")
+	@_traceScriptScope
+	def script_reverse_review_currentCharacter(self,gesture):
+		info=api.getReviewPosition().copy()
+		info.expand(textInfos.UNIT_CHARACTER)
+		if _traceRecorder is not None and _traceRecorder.recording:
+			_recordScript("reverse_review_currentCharacter", info)
+		with reviewing(direction=-1):
+			speech.spellTextInfo(info,useCharacterDescriptions=True)
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the toggle latency measurement command.
+			"Toggles the measurement of the time taken by the CJK enhanced UI speech and braille review."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_toggleInstrumentation(self, gesture):
+		instrumentation.enabled = not instrumentation.enabled
+		config.conf["CJKEnhancedUI"]["instrumentation"] = instrumentation.enabled
+		if instrumentation.enabled:
+			instrumentation.reset()
+			# Translators: Reported when the measurement of review latency is turned on.
+			ui.message(_("Review latency measurement on"))
+		else:
+			# Translators: Reported when the measurement of review latency is turned off.
+			ui.message(_("Review latency measurement off"))
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the report latency command.
+			"Writes the measured time taken by the CJK enhanced UI speech and braille review to the NVDA log."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_reportLatency(self, gesture):
+		if not instrumentation.enabled:
+			# Translators: Reported when asking for the review latency report while measurement is off.
+			ui.message(_("Review latency measurement is off"))
+			return
+		report = "\n".join(instrumentation.getReport())
+		log.info(f"CJKEnhancedUI review latency in microseconds:\n{report}\nReview record cache: {descriptionIndex.reviewRecordCache.stats()}\nBraille cell cache: {brailleCells.cellCache.stats()}\nBraille page cache: {braillePager.pageCache.stats()}\nReading shards: {_getReadingStats()}")
+		# Translators: Reported when the review latency report has been written to the NVDA log.
+		ui.message(_("Review latency written to the log"))
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the toggle profiling command.
+			"Starts or stops profiling the CJK enhanced UI speech and braille review, saving the profile to the NVDA user configuration directory."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_toggleProfiling(self, gesture):
+		from . import profiling
+		if not profiling.isRunning():
+			profiling.start()
+			# Translators: Reported when profiling is started.
+			ui.message(_("Profiling started"))
+			return
+		if profiling.stop():
+			# Translators: Reported when profiling is stopped and the profile has been saved.
+			ui.message(_("Profiling stopped, profile saved"))
+		else:
+			# Translators: Reported when profiling is stopped before any review happened.
+			ui.message(_("Profiling stopped, nothing was profiled"))
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the toggle trace recording command.
+			"Starts or stops recording the text reviewed and typed into a CJK enhanced UI trace file, for performance analysis."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_toggleTraceRecording(self, gesture):
+		global _traceRecorder
+		if _traceRecorder is not None and _traceRecorder.recording:
+			_traceRecorder.stop()
+			# Translators: Reported when trace recording is stopped.
+			ui.message(_("Trace recording stopped"))
+			return
+		from . import traceRecorder
+		_traceRecorder = traceRecorder
+		header = {name: getattr(settings, name) for name in SettingsSnapshot.__slots__}
+		traceRecorder.start(header)
+		# Translators: Reported when trace recording is started.
+		ui.message(_("Trace recording started"))
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the find character by description command.
+			"Finds the characters whose descriptions contain a given text."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_findCharacterByDescription(self, gesture):
+		import gui
+		import wx
+		from . import reverseIndex
+		#Index the descriptions while the query is typed.
+		if reverseIndex.getBuiltReverseIndex(settings.locale) is None:
+			reverseIndex.warmUp(settings.locale)
+		dialog = wx.TextEntryDialog(
+			gui.mainFrame,
+			# Translators: The label of the text field of the find character by description dialog.
+			_("Text contained in the description:"),
+			# Translators: The title of the find character by description dialog.
+			_("Find character by description"),
+		)
+
+		def callback(result):
+			if result == wx.ID_OK:
+				reportCharacterSearch(dialog.GetValue())
+
+		gui.runScriptModalDialog(dialog, callback)
+
+	@script(
+		description=_(
+			# Translators: Input help mode message for the reload user character descriptions command.
+			"Reloads the user character descriptions, applying the changes made to them at once."
+		),
+		category=ADDON_SUMMARY,
+	)
+	def script_reloadUserDescriptions(self, gesture):
+		count = reloadUserDescriptions()
+		ui.message(ngettext(
+			# Translators: Reported when the user character descriptions are reloaded.
+			"%d user character description changed",
+			"%d user character descriptions changed",
+			count,
+		)%count)
+
+	def terminate(self):
+		config.post_configProfileSwitch.unregister(self.handleConfigChange)
+		config.post_configReset.unregister(self.handleConfigChange)
+		config.post_configSave.unregister(self.handleConfigChange)
+		synthDriverHandler.synthChanged.unregister(self.handleConfigChange)
+		braille.displayChanged.unregister(brailleCells.invalidate)
+		braille.displayChanged.unregister(braillePager.invalidate)
+		self._userDescriptionsTimer.Stop()
+		log.debug(f"CJKEnhancedUI review record cache: {descriptionIndex.reviewRecordCache.stats()}")
+		log.debug(f"CJKEnhancedUI braille cell cache: {brailleCells.cellCache.stats()}")
+		log.debug(f"CJKEnhancedUI braille page cache: {braillePager.pageCache.stats()}")
+		log.debug(f"CJKEnhancedUI line prefetch: {linePrefetcher.stats()}")
+		log.debug(f"CJKEnhancedUI reading shards: {_getReadingStats()}")
+		linePrefetcher.clear()
+		log.debug(f"CJKEnhancedUI auto braille review descriptions dropped: {autoBrailleReviewDebouncer.dropped}")
+		log.debug(f"CJKEnhancedUI composition announcements dropped: {compositionAnnouncementQueue.dropped}")
+		autoBrailleReviewDebouncer.cancel()
+		if _traceRecorder is not None:
+			_traceRecorder.stop()
+		profiling = _getLoadedModule("profiling")
+		if profiling is not None:
+			profiling.stop()
+		for name in list(self._installedHooks):
+			self._setHookInstalled(name, False)
+		super().terminate()
+
+
+_importEndTime = time.perf_counter()
@@ -0,0 +1,72 @@
+# brailleCells.py
+# Part of CJKEnhancedUI
+# Shows braille messages through a cache of their translated cells, so messages shown again skip translation.
+
+import braille
+from braille import handler
+import config
+import keyboardHandler
+
+from .lru import LRUCache
+
+#: Translated messages, keyed by (translation table, message text).
+cellCache = LRUCache(maxSize=1024)
+
+#: The value of the showMessages braille setting which disables messages.
+SHOW_MESSAGES_DISABLED = 0
+
+
+class CachedTextRegion(braille.TextRegion):
+	"""
+	A text region which reuses the cells of a previous translation of the same text with the same table.
+	Message regions have no cursor or selection, so the cells only depend on these two.
+	"""
+
+	def update(self):
+		key = (config.conf["braille"]["translationTable"], self.rawText)
+		translation = cellCache.get(key)
+		if translation is None:
+			super().update()
+			cellCache.put(key, (tuple(self.brailleCells), tuple(self.brailleToRawPos), tuple(self.rawToBraillePos)))
+			return
+		brailleCells, brailleToRawPos, rawToBraillePos = translation
+		#The buffer may extend these lists, so each region gets its own copies.
+		self.brailleCells = list(brailleCells)
+		self.brailleToRawPos = list(brailleToRawPos)
+		self.rawToBraillePos = list(rawToBraillePos)
+		self.brailleCursorPos = None
+		self.brailleSelectionStart = self.brailleSelectionEnd = None
+
+
+def showMessage(text: str):
+	"""
+	Shows a message on the braille display the way L{BrailleHandler.message} does,
+	through a L{CachedTextRegion} so that it is only translated when not cached.
+	Must be called from the main thread.
+	"""
+	if (
+		not handler.enabled
+		or config.conf["braille"]["showMessages"] == SHOW_MESSAGES_DISABLED
+		or text is None
+	):
+		return
+	if handler.buffer is handler.messageBuffer:
+		handler.buffer.clear()
+	else:
+		handler.buffer = handler.messageBuffer
+	region = CachedTextRegion(text)
+	region.update()
+	handler.buffer.regions.append(region)
+	handler.buffer.update()
+	handler.update()
+	#Dismisses the message after the configured timeout, as for messages shown by NVDA.
+	handler._resetMessageTimer()
+	#Only keys pressed from now on dismiss the message when the focused region updates.
+	handler._keyCountForLastMessage = keyboardHandler.keyCounter
+
+
+def invalidate():
+	"""
+	Discards the cached cells, for when the display or the braille configuration changed.
+	"""
+	cellCache.clear()
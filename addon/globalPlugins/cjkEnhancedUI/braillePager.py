@@ -0,0 +1,68 @@
+# braillePager.py
+# Part of CJKEnhancedUI
+# Splits the braille review message of a character into pages which fit on the braille display.
+
+from typing import Tuple
+
+import braille
+import config
+
+from .lru import LRUCache
+
+#: The pages of review records, keyed by (locale, character, display cell count, translation table).
+pageCache = LRUCache(maxSize=1024)
+
+
+def getCellCount(text: str) -> int:
+	"""
+	@return: the number of cells text takes once translated with the current braille table.
+	"""
+	#Measured texts are not shown, so they are kept out of the cache of shown messages.
+	region = braille.TextRegion(text)
+	region.update()
+	return len(region.brailleCells)
+
+
+def paginate(record, displaySize: int) -> Tuple[str, ...]:
+	"""
+	Fills pages with whole descriptions, each page starting with the character it describes.
+	A description which does not fit on a page by itself gets a page of its own, scrolled as any long message.
+	@param record: the review record of a character with descriptions.
+	@type record: descriptionIndex.ReviewRecord
+	@param displaySize: the number of cells of the display, or 0 to keep every description on a single page.
+	@return: the pages, only the braille review message when it fits on the display.
+	"""
+	if displaySize <= 0 or getCellCount(record.brailleMessage) <= displaySize:
+		return (record.brailleMessage,)
+	character = record.character
+	pages = []
+	page = ""
+	for description in record.descriptions:
+		candidate = page + " " + description if page else character + " " + description
+		if page and getCellCount(candidate) > displaySize:
+			pages.append(page)
+			candidate = character + " " + description
+		page = candidate
+	pages.append(page)
+	return tuple(pages)
+
+
+def getPages(locale: str, record) -> Tuple[str, ...]:
+	"""
+	@param record: the review record of the character.
+	@type record: descriptionIndex.ReviewRecord
+	@return: the braille review pages of the character for the current display and translation table,
+		or an empty tuple if the character has no descriptions.
+	"""
+	if not record.descriptions:
+		return ()
+	displaySize = braille.handler.displaySize
+	key = (locale, record.character, displaySize, config.conf["braille"]["translationTable"])
+	return pageCache.getOrCreate(key, lambda: paginate(record, displaySize))
+
+
+def invalidate():
+	"""
+	Discards the cached pages, for when the braille configuration or the descriptions changed.
+	"""
+	pageCache.clear()
@@ -0,0 +1,163 @@
+# charClass.py
+# Part of CJKEnhancedUI
+# A table driven classifier of characters into the scripts the review modes care about.
+
+from bisect import bisect_right
+import enum
+from typing import (
+	List,
+	Tuple,
+)
+
+
+class CharClass(enum.IntEnum):
+	OTHER = 0
+	#: The basic Latin letters a-z and A-Z, which NVDA spells phonetically.
+	LATIN = 1
+	DIGIT = 2
+	CJK_IDEOGRAPH = 3
+	KANA = 4
+	HANGUL = 5
+	BOPOMOFO = 6
+	PUNCTUATION = 7
+	SPACE = 8
+
+
+#: Inclusive code point ranges of each class, in ascending order. Code points outside of them are OTHER.
+_RANGES: List[Tuple[int, int, CharClass]] = [
+	(0x0009, 0x000D, CharClass.SPACE),
+	(0x0020, 0x0020, CharClass.SPACE),
+	(0x0021, 0x002F, CharClass.PUNCTUATION),
+	(0x0030, 0x0039, CharClass.DIGIT),
+	(0x003A, 0x0040, CharClass.PUNCTUATION),
+	(0x0041, 0x005A, CharClass.LATIN),
+	(0x005B, 0x0060, CharClass.PUNCTUATION),
+	(0x0061, 0x007A, CharClass.LATIN),
+	(0x007B, 0x007E, CharClass.PUNCTUATION),
+	(0x00A0, 0x00A0, CharClass.SPACE),
+	(0x00A1, 0x00BF, CharClass.PUNCTUATION),
+	(0x1100, 0x11FF, CharClass.HANGUL),
+	(0x2000, 0x200A, CharClass.SPACE),
+	(0x2010, 0x2027, CharClass.PUNCTUATION),
+	(0x2030, 0x205E, CharClass.PUNCTUATION),
+	(0x2E80, 0x2FDF, CharClass.CJK_IDEOGRAPH),
+	(0x3000, 0x3000, CharClass.SPACE),
+	(0x3001, 0x3004, CharClass.PUNCTUATION),
+	(0x3005, 0x3007, CharClass.CJK_IDEOGRAPH),
+	(0x3008, 0x3020, CharClass.PUNCTUATION),
+	(0x3021, 0x3029, CharClass.CJK_IDEOGRAPH),
+	(0x3030, 0x303F, CharClass.PUNCTUATION),
+	(0x3040, 0x309F, CharClass.KANA),
+	(0x30A0, 0x30FA, CharClass.KANA),
+	(0x30FB, 0x30FB, CharClass.PUNCTUATION),
+	(0x30FC, 0x30FF, CharClass.KANA),
+	(0x3100, 0x312F, CharClass.BOPOMOFO),
+	(0x3130, 0x318F, CharClass.HANGUL),
+	(0x31A0, 0x31BF, CharClass.BOPOMOFO),
+	(0x31F0, 0x31FF, CharClass.KANA),
+	(0x3400, 0x4DBF, CharClass.CJK_IDEOGRAPH),
+	(0x4E00, 0x9FFF, CharClass.CJK_IDEOGRAPH),
+	(0xA960, 0xA97F, CharClass.HANGUL),
+	(0xAC00, 0xD7FF, CharClass.HANGUL),
+	(0xF900, 0xFAFF, CharClass.CJK_IDEOGRAPH),
+	(0xFE10, 0xFE19, CharClass.PUNCTUATION),
+	(0xFE30, 0xFE6B, CharClass.PUNCTUATION),
+	(0xFF01, 0xFF0F, CharClass.PUNCTUATION),
+	(0xFF10, 0xFF19, CharClass.DIGIT),
+	(0xFF1A, 0xFF20, CharClass.PUNCTUATION),
+	(0xFF3B, 0xFF40, CharClass.PUNCTUATION),
+	(0xFF5B, 0xFF65, CharClass.PUNCTUATION),
+	(0xFF66, 0xFF9F, CharClass.KANA),
+	(0xFFA0, 0xFFDC, CharClass.HANGUL),
+	(0x1B000, 0x1B16F, CharClass.KANA),
+	(0x20000, 0x2A6DF, CharClass.CJK_IDEOGRAPH),
+	(0x2A700, 0x2EBEF, CharClass.CJK_IDEOGRAPH),
+	(0x2F800, 0x2FA1F, CharClass.CJK_IDEOGRAPH),
+	(0x30000, 0x323AF, CharClass.CJK_IDEOGRAPH),
+]
+
+
+def _buildTable(ranges: List[Tuple[int, int, CharClass]]) -> Tuple[List[int], bytes]:
+	"""
+	Turns the ranges into block boundaries for a bisect lookup.
+	@return: the first code point of each block and the class of each block.
+	"""
+	starts = [0]
+	classes = [CharClass.OTHER]
+	for start, end, charClass in ranges:
+		if start < starts[-1]:
+			raise ValueError(f"Overlapping or unsorted range {start:#x}-{end:#x}")
+		if start == starts[-1]:
+			classes[-1] = charClass
+		else:
+			starts.append(start)
+			classes.append(charClass)
+		starts.append(end + 1)
+		classes.append(CharClass.OTHER)
+	return starts, bytes(classes)
+
+
+_starts, _classes = _buildTable(_RANGES)
+#: The class of every ASCII character, usable with bytes.translate.
+_asciiTable = bytes(_classes[bisect_right(_starts, c) - 1] for c in range(128)) + bytes(128)
+
+
+def classifyCodePoint(codePoint: int) -> int:
+	"""
+	@return: the L{CharClass} value of a code point.
+	"""
+	if codePoint < 128:
+		return _asciiTable[codePoint]
+	return _classes[bisect_right(_starts, codePoint) - 1]
+
+
+def classify(char: str) -> CharClass:
+	"""
+	Classifies the first character of a string.
+	@param char: a given character
+	@return: the class of the character, OTHER for an empty string.
+	"""
+	if not char:
+		return CharClass.OTHER
+	return CharClass(classifyCodePoint(ord(char[0])))
+
+
+class _TranslationTable(dict):
+	"""
+	Maps code points to their class as a one character string, for use with str.translate.
+	Code points are classified when first seen, so the table only grows with the characters actually read.
+	"""
+
+	def __missing__(self, codePoint: int) -> str:
+		value = self[codePoint] = chr(classifyCodePoint(codePoint))
+		return value
+
+
+_translationTable = _TranslationTable()
+
+
+def classifyText(text: str) -> bytes:
+	"""
+	Classifies every character of a string at once.
+	@return: the L{CharClass} value of each character, one byte per character.
+	"""
+	if text.isascii():
+		return text.encode("ascii").translate(_asciiTable)
+	return text.translate(_translationTable).encode("latin-1")
+
+
+def isLatinLetter(char: str) -> bool:
+	"""
+	Checks whether a character is within the ranges a-z and A-Z.
+	"""
+	return classify(char) == CharClass.LATIN
+
+
+def shouldDescribe(char: str) -> bool:
+	"""
+	Checks whether a character should have its description reported by the review modes.
+	Latin letters are excluded, so that moving the caret or typing does not spell the alphabet phonetically.
+	@param char: a given character
+	@return: whether descriptions should be looked up for the character.
+	"""
+	return classify(char) != CharClass.LATIN
@@ -0,0 +1,257 @@
+# compiledDictionary.py
+# Part of CJKEnhancedUI
+# Compiles character description dictionaries into a binary file which is memory mapped and read without parsing.
+#
+# File layout, header integers little endian, tables in native byte order, which is little endian on Windows:
+# header: magic b"CJKD", version (uint16), source count (uint16), entry count, pool size and extras size (uint32 each)
+# for each source dictionary: size and modification time in nanoseconds (uint64 each), SHA-1 digest (20 bytes),
+# path length (uint16) and UTF-8 path
+# padding to a multiple of 4 bytes
+# sorted code points of the single character entries (uint32 each)
+# offsets of the entries in the pool, plus the end of the pool (uint32 each)
+# pool: the descriptions of each entry, UTF-8 encoded and separated by tabs
+# extras: entries whose key is longer than one character, as UTF-8 lines of tab separated fields
+
+from array import array
+from bisect import bisect_left
+import codecs
+import hashlib
+import mmap
+import os
+import struct
+from typing import (
+	Dict,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Sequence,
+	Tuple,
+)
+
+from logHandler import log
+
+MAGIC = b"CJKD"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIII")
+_SOURCE = struct.Struct("<QQ20sH")
+
+
+class SourceStamp(NamedTuple):
+	"""
+	Identifies the version of a source dictionary a compiled file was built from.
+	"""
+	path: str
+	size: int
+	mtimeNs: int
+	sha1: bytes
+
+
+def _hashFile(path: str) -> bytes:
+	digest = hashlib.sha1()
+	with open(path, "rb") as f:
+		for block in iter(lambda: f.read(1 << 16), b""):
+			digest.update(block)
+	return digest.digest()
+
+
+def stampSource(path: str) -> SourceStamp:
+	stat = os.stat(path)
+	return SourceStamp(path, stat.st_size, stat.st_mtime_ns, _hashFile(path))
+
+
+def parseDictionary(path: str) -> Dict[str, List[str]]:
+	"""
+	Parses a characterDescriptions.dic file the way NVDA's characterProcessing does.
+	"""
+	entries = {}
+	with codecs.open(path, "r", "utf_8_sig", errors="replace") as f:
+		for line in f:
+			if line.isspace() or line.startswith("#"):
+				continue
+			fields = line.rstrip("\r\n").split("\t")
+			if len(fields) > 1:
+				entries[fields[0]] = fields[1:]
+	return entries
+
+
+def _packSources(stamps: Sequence[SourceStamp]) -> bytes:
+	packed = bytearray()
+	for stamp in stamps:
+		encodedPath = stamp.path.encode("utf-8")
+		packed += _SOURCE.pack(stamp.size, stamp.mtimeNs, stamp.sha1, len(encodedPath)) + encodedPath
+	return bytes(packed)
+
+
+def compileDictionaries(sources: Sequence[str], target: str):
+	"""
+	Merges source dictionaries into a compiled file. Entries of later sources override those of earlier ones.
+	The file is written next to the target and then moved over it, so readers never see a partial file.
+	@param sources: paths of the source dictionaries, least specific first.
+	"""
+	stamps = [stampSource(path) for path in sources]
+	entries: Dict[str, List[str]] = {}
+	for path in sources:
+		entries.update(parseDictionary(path))
+	codePoints = array("I")
+	offsets = array("I")
+	pool = bytearray()
+	extras = bytearray()
+	for key in sorted(entries, key=lambda key: (len(key) != 1, key)):
+		encoded = "\t".join(entries[key]).encode("utf-8")
+		if len(key) == 1:
+			codePoints.append(ord(key))
+			offsets.append(len(pool))
+			pool += encoded
+		else:
+			extras += key.encode("utf-8") + b"\t" + encoded + b"\n"
+	offsets.append(len(pool))
+	header = bytearray(_HEADER.pack(MAGIC, VERSION, len(stamps), len(codePoints), len(pool), len(extras)))
+	header += _packSources(stamps)
+	header += bytes(-len(header) % 4)
+	temporary = f"{target}.{os.getpid()}.tmp"
+	with open(temporary, "wb") as f:
+		f.write(header)
+		f.write(codePoints.tobytes())
+		f.write(offsets.tobytes())
+		f.write(pool)
+		f.write(extras)
+	os.replace(temporary, target)
+
+
+def _readHeader(data) -> Tuple[Tuple[int, int, int], List[SourceStamp], int]:
+	"""
+	@return: the entry count, pool size and extras size, the source stamps and the offset of the code point table.
+	"""
+	magic, version, sourceCount, entryCount, poolSize, extrasSize = _HEADER.unpack_from(data, 0)
+	if magic != MAGIC or version != VERSION:
+		raise ValueError("Not a compiled description dictionary of a supported version")
+	position = _HEADER.size
+	stamps = []
+	for _index in range(sourceCount):
+		size, mtimeNs, sha1, pathLength = _SOURCE.unpack_from(data, position)
+		position += _SOURCE.size
+		path = bytes(data[position:position + pathLength]).decode("utf-8")
+		position += pathLength
+		stamps.append(SourceStamp(path, size, mtimeNs, sha1))
+	position += -position % 4
+	return (entryCount, poolSize, extrasSize), stamps, position
+
+
+def _rewriteStamps(target: str, stamps: Sequence[SourceStamp]):
+	"""
+	Records new stamps of the same sources in a compiled file, in place, as they take as many bytes as the old ones.
+	"""
+	try:
+		with open(target, "r+b") as f:
+			f.seek(_HEADER.size)
+			f.write(_packSources(stamps))
+	except OSError:
+		log.debugWarning(f"Failed to update the source stamps of {target}", exc_info=True)
+
+
+def isUpToDate(target: str, sources: Sequence[str]) -> bool:
+	"""
+	Checks whether a compiled file was built from the current version of the given sources.
+	Sources are only hashed when their size or modification time differ from those recorded.
+	When a source was touched without changing, its new modification time is recorded,
+	so that it is not hashed again on every load.
+	"""
+	try:
+		with open(target, "rb") as f:
+			header = f.read(4096)
+		_sizes, stamps, _position = _readHeader(header)
+	except (OSError, ValueError, struct.error):
+		return False
+	if [stamp.path for stamp in stamps] != list(sources):
+		return False
+	touched = False
+	for index, stamp in enumerate(stamps):
+		try:
+			stat = os.stat(stamp.path)
+		except OSError:
+			return False
+		if stat.st_size != stamp.size:
+			return False
+		if stat.st_mtime_ns != stamp.mtimeNs:
+			if _hashFile(stamp.path) != stamp.sha1:
+				return False
+			stamps[index] = stamp._replace(mtimeNs=stat.st_mtime_ns)
+			touched = True
+	if touched:
+		_rewriteStamps(target, stamps)
+	return True
+
+
+class CompiledDescriptions:
+	"""
+	Read only access to a compiled description dictionary through a memory map.
+	Lookups bisect the code point table and decode only the descriptions of the requested character.
+	"""
+
+	def __init__(self, path: str, locale: str = ""):
+		self.locale = locale
+		self.path = path
+		with open(path, "rb") as f:
+			self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		data = memoryview(self._mmap)
+		(entryCount, poolSize, extrasSize), self.sources, position = _readHeader(data)
+		self._codePoints = data[position:position + 4 * entryCount].cast("I")
+		position += 4 * entryCount
+		self._offsets = data[position:position + 4 * (entryCount + 1)].cast("I")
+		position += 4 * (entryCount + 1)
+		self._pool = data[position:position + poolSize]
+		position += poolSize
+		self._extras: Dict[str, Tuple[str, ...]] = {}
+		for line in bytes(data[position:position + extrasSize]).decode("utf-8").splitlines():
+			key, _separator, descriptions = line.partition("\t")
+			self._extras[key] = tuple(descriptions.split("\t"))
+		self._entryCount = entryCount
+
+	def __len__(self) -> int:
+		return self._entryCount + len(self._extras)
+
+	def items(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+		"""
+		@return: every character and its descriptions, decoding them one entry at a time.
+		"""
+		offsets = self._offsets
+		for index, codePoint in enumerate(self._codePoints):
+			yield chr(codePoint), tuple(str(self._pool[offsets[index]:offsets[index + 1]], "utf-8").split("\t"))
+		yield from self._extras.items()
+
+	def getCharacterDescription(self, character: str) -> Optional[Tuple[str, ...]]:
+		"""
+		@param character: the character who's description should be retrieved.
+		@return: the descriptions for the character, or None if there is none.
+		"""
+		if len(character) != 1:
+			return self._extras.get(character)
+		codePoint = ord(character)
+		codePoints = self._codePoints
+		index = bisect_left(codePoints, codePoint)
+		if index == self._entryCount or codePoints[index] != codePoint:
+			return None
+		return tuple(str(self._pool[self._offsets[index]:self._offsets[index + 1]], "utf-8").split("\t"))
+
+	def close(self):
+		"""
+		Releases the memory map at once, for owners no other thread reads the descriptions from.
+		Otherwise, the map is released when the last reference to the descriptions is dropped.
+		"""
+		for view in (self._codePoints, self._offsets, self._pool):
+			view.release()
+		self._mmap.close()
+
+
+def load(locale: str, sources: Sequence[str], directory: str) -> CompiledDescriptions:
+	"""
+	Maps the compiled dictionary of a locale, compiling it first if it is missing or its sources changed.
+	@param sources: paths of the source dictionaries, least specific first.
+	@param directory: where compiled dictionaries are kept.
+	"""
+	target = os.path.join(directory, f"characterDescriptions-{locale}.bin")
+	if not isUpToDate(target, sources):
+		log.debug(f"Compiling character descriptions for {locale} from {', '.join(sources)}")
+		compileDictionaries(sources, target)
+	return CompiledDescriptions(target, locale)
@@ -0,0 +1,294 @@
+# descriptionIndex.py
+# Part of CJKEnhancedUI
+# A pre-merged character description index with the locale fallback chain built in,
+# and a cache of the per-character records the review paths are built from.
+
+import os
+import threading
+import time
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Tuple,
+)
+
+import characterProcessing
+from logHandler import log
+
+from . import userDescriptions
+from .lru import LRUCache
+
+#: The locale consulted last when no description is found for the requested locale.
+FALLBACK_LOCALE = "en"
+
+_indexes: Dict[str, "DescriptionIndex"] = {}
+#: Guards _indexes and _buildLocks, only held for lookups and stores, never while an index is built.
+_indexesLock = threading.Lock()
+#: Serializes the builds of each locale, so that a slow build does not hold up lookups of other locales.
+_buildLocks: Dict[str, threading.Lock] = {}
+#: Incremented by L{invalidate}, so that indexes built meanwhile from outdated settings are not kept.
+_generation = 0
+
+#: Review records of recently reviewed characters, keyed by (locale, character).
+reviewRecordCache = LRUCache(maxSize=4096)
+
+#: How indexes hold their descriptions: "dict" merges characterProcessing's data into a dictionary,
+#: "compiled" memory maps a compiled dictionary built from NVDA's description files,
+#: "interned" keeps the descriptions of NVDA's description files once each in a compact string pool.
+storage = "dict"
+
+#: Whether the readings of characters are part of their description cycle.
+readings = False
+
+
+def getLocaleChain(locale: str) -> List[str]:
+	"""
+	Lists the locales whose descriptions apply to the given locale, most specific first.
+	@param locale: the locale (language[_COUNTRY]) the description should be for.
+	@return: the locale, its language and the fallback locale, without duplicates.
+	"""
+	chain = []
+	for candidate in (locale, locale.split("_")[0], FALLBACK_LOCALE):
+		if candidate and candidate not in chain:
+			chain.append(candidate)
+	return chain
+
+
+class DescriptionIndex:
+	"""
+	All character descriptions available to a locale, merged into a single dictionary.
+	Entries of the locale override those of its language, which override those of the fallback locale,
+	so a lookup is a single dictionary probe.
+	"""
+
+	def __init__(self, locale: str):
+		self.locale = locale
+		entries: Dict[str, Tuple[str, ...]] = {}
+		for candidate in reversed(getLocaleChain(locale)):
+			try:
+				data = characterProcessing._charDescLocaleDataMap.fetchLocaleData(candidate, fallback=False)
+			except LookupError:
+				continue
+			for character, descriptions in data._entries.items():
+				entries[character] = tuple(descriptions)
+		self._entries = entries
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def items(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+		"""
+		@return: every character and its descriptions.
+		"""
+		return iter(self._entries.items())
+
+	def getCharacterDescription(self, character: str) -> Optional[Tuple[str, ...]]:
+		"""
+		@param character: the character who's description should be retrieved.
+		@return: the descriptions for the character, or None if there is none.
+		"""
+		return self._entries.get(character)
+
+
+def _buildIndex(locale: str):
+	if storage in ("compiled", "interned"):
+		from . import compiledDictionary, paths
+		sources = [
+			path for path in map(paths.getCharacterDescriptionsFile, reversed(getLocaleChain(locale)))
+			if os.path.isfile(path)
+		]
+		if sources:
+			try:
+				if storage == "compiled":
+					return compiledDictionary.load(locale, sources, paths.getConfigDirectory())
+				from .internedDescriptions import InternedDescriptions
+				#The files are parsed here rather than through characterProcessing, which would keep its own copy.
+				entries: Dict[str, List[str]] = {}
+				for path in sources:
+					entries.update(compiledDictionary.parseDictionary(path))
+				return InternedDescriptions(entries.items(), locale)
+			except Exception:
+				log.error(f"Failed to load {storage} character descriptions for {locale}", exc_info=True)
+	return DescriptionIndex(locale)
+
+
+def getIndex(locale: str) -> DescriptionIndex:
+	"""
+	Fetches the description index for a locale, building it on first use.
+	"""
+	index = _indexes.get(locale)
+	if index is not None:
+		return index
+	with _indexesLock:
+		buildLock = _buildLocks.setdefault(locale, threading.Lock())
+	with buildLock:
+		index = _indexes.get(locale)
+		if index is None:
+			generation = _generation
+			index = _buildIndex(locale)
+			with _indexesLock:
+				if generation == _generation:
+					_indexes[locale] = index
+	return index
+
+
+def setStorage(name: str):
+	"""
+	Selects how indexes hold their descriptions, rebuilding them if this changes.
+	@param name: one of the values documented for L{storage}.
+	"""
+	global storage
+	if name != storage:
+		storage = name
+		invalidate()
+
+
+def setReadings(enabled: bool) -> bool:
+	"""
+	Selects whether readings are part of the description cycle, discarding the review records if this changes.
+	@return: whether the setting changed.
+	"""
+	global readings
+	if enabled == readings:
+		return False
+	readings = enabled
+	reviewRecordCache.clear()
+	return True
+
+
+def getCharacterDescription(locale: str, character: str) -> Optional[Tuple[str, ...]]:
+	"""
+	Equivalent of characterProcessing.getCharacterDescription backed by the merged index,
+	with the user's descriptions applied.
+	@param locale: the locale (language[_COUNTRY]) the description should be for.
+	@param character: the character who's description should be retrieved.
+	@return: the descriptions for the character, or None if there is none.
+	"""
+	return userDescriptions.apply(locale, character, getIndex(locale).getCharacterDescription(character))
+
+
+def iterDescriptions(locale: str) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+	"""
+	@return: every character described for a locale and its descriptions, as L{getCharacterDescription} resolves them.
+	"""
+	return userDescriptions.mergeItems(locale, getIndex(locale).items())
+
+
+class ReviewRecord(NamedTuple):
+	"""
+	Everything the speech and braille review paths need for one character, computed once.
+	"""
+	#: The reviewed character.
+	character: str
+	#: The descriptions of the character, empty if there are none.
+	descriptions: Tuple[str, ...]
+	#: The decimal and hexadecimal representation of the character, as spoken after its descriptions.
+	codePointSuffix: str
+	#: The readings of the character in the locale's reading system, or None if there are none.
+	reading: Optional[str]
+	#: The descriptions followed by the reading and the code point suffix, as enumerated by the review scripts.
+	descriptionCycle: Tuple[str, ...]
+	#: The message displayed in braille review mode, or None if there are no descriptions.
+	brailleMessage: Optional[str]
+	#: The character followed by its first description, as spoken when the cursor moves onto it.
+	firstSpeechText: Optional[str]
+
+
+def _makeReviewRecord(locale: str, character: str) -> ReviewRecord:
+	descriptions = getCharacterDescription(locale, character.lower()) or ()
+	if len(character) == 1:
+		c = ord(character)
+		codePointSuffix = "%d," % c+" - ".join(hex(c))
+	else:
+		codePointSuffix = ""
+	reading = None
+	if readings and descriptions:
+		#Readings are off by default, so their module is only imported once they are turned on.
+		from . import readingIndex
+		reading = readingIndex.getReading(locale, character.lower())
+	if descriptions:
+		brailleMessage = character+" "+" ".join(descriptions)
+		firstSpeechText = character+" "+descriptions[0]
+	else:
+		brailleMessage = firstSpeechText = None
+	return ReviewRecord(
+		character=character,
+		descriptions=descriptions,
+		codePointSuffix=codePointSuffix,
+		reading=reading,
+		descriptionCycle=descriptions+((reading,) if reading else ())+(codePointSuffix,) if descriptions else (),
+		brailleMessage=brailleMessage,
+		firstSpeechText=firstSpeechText,
+	)
+
+
+def getReviewRecord(locale: str, character: str) -> ReviewRecord:
+	"""
+	Fetches the review record of a character, building it on a cache miss.
+	@param locale: the locale (language[_COUNTRY]) the descriptions should be for.
+	@param character: the reviewed character. Descriptions are looked up for its lower case form.
+	"""
+	key = (locale, character)
+	record = reviewRecordCache.get(key)
+	if record is None:
+		record = _makeReviewRecord(locale, character)
+		reviewRecordCache.put(key, record)
+	return record
+
+
+def warmUp(locales: Iterable[str]) -> threading.Thread:
+	"""
+	Builds the indexes of the given locales on a background thread,
+	so that the first reviewed character does not pay for parsing the description dictionaries.
+	A lookup made before the warm up finishes waits for the index being built instead of building it again.
+	@return: the started thread.
+	"""
+	locales = list(dict.fromkeys(locales))
+
+	def run():
+		for locale in locales:
+			start = time.perf_counter()
+			try:
+				index = getIndex(locale)
+				if readings:
+					from . import readingIndex
+					#Most reviewed characters are in the CJK Unified Ideographs block, whose readings are loaded with the descriptions.
+					readingIndex.getReading(locale, "\u4e00")
+			except Exception:
+				log.error(f"Failed to warm up character descriptions for {locale}", exc_info=True)
+				continue
+			log.debug(
+				f"Warmed up {len(index)} character descriptions for {locale}"
+				f" in {time.perf_counter() - start:.3f} s"
+			)
+
+	thread = threading.Thread(target=run, name="CJKEnhancedUI.descriptionWarmUp", daemon=True)
+	thread.start()
+	return thread
+
+
+def evictCharacters(locale: str, characters: Iterable[str]):
+	"""
+	Drops the cached review records of characters whose descriptions changed, keeping those of every other character.
+	@param characters: the changed characters, in the lower case form descriptions are looked up for.
+	"""
+	for character in characters:
+		reviewRecordCache.evict((locale, character))
+		reviewRecordCache.evict((locale, character.upper()))
+
+
+def invalidate():
+	"""
+	Drops every built index and cached review record, so that they are rebuilt on next use.
+	Indexes are not closed, as other threads, such as a warm up or a reverse index build, may still be reading them.
+	A compiled index releases its memory map once its last reader drops it.
+	"""
+	global _generation
+	with _indexesLock:
+		_indexes.clear()
+		_generation += 1
+	reviewRecordCache.clear()
@@ -0,0 +1,171 @@
+# instrumentation.py
+# Part of CJKEnhancedUI
+# Optional latency histograms and profiling of the add-on's hooks and scripts.
+
+from array import array
+import functools
+import inspect
+from time import perf_counter_ns
+from typing import (
+	Callable,
+	Dict,
+	List,
+)
+
+#: Whether timings are recorded. When False, and no profiler is set, timed functions only pay for checking this.
+enabled = False
+
+#: A profiler enabled for the duration of the outermost timed call, when a profiling session is running.
+profiler = None
+_profileDepth = 0
+
+#: Each power of two of nanoseconds is split in this many buckets.
+_SUB_BUCKETS = 4
+_BUCKET_COUNT = 64 * _SUB_BUCKETS
+
+
+def _bucketOf(nanoseconds: int) -> int:
+	bits = nanoseconds.bit_length()
+	if bits < 3:
+		return nanoseconds
+	#The bucket is given by the position of the leading bit and the two bits following it.
+	return (bits - 1) * _SUB_BUCKETS + ((nanoseconds >> (bits - 3)) & 3)
+
+
+def _bucketUpperBound(bucket: int) -> int:
+	if bucket < _SUB_BUCKETS:
+		return bucket + 1
+	power, subBucket = divmod(bucket, _SUB_BUCKETS)
+	return (1 << power) + ((subBucket + 1) << (power - 2))
+
+
+class Histogram:
+	"""
+	A fixed size histogram of durations, with buckets growing geometrically so that the relative error stays below 25%.
+	"""
+
+	def __init__(self):
+		self.counts = array("Q", bytes(8 * _BUCKET_COUNT))
+		self.count = 0
+		self.totalNanoseconds = 0
+		self.maxNanoseconds = 0
+
+	def record(self, nanoseconds: int):
+		self.counts[_bucketOf(nanoseconds)] += 1
+		self.count += 1
+		self.totalNanoseconds += nanoseconds
+		if nanoseconds > self.maxNanoseconds:
+			self.maxNanoseconds = nanoseconds
+
+	def percentile(self, fraction: float) -> int:
+		"""
+		@return: an upper bound, in nanoseconds, of the duration below which the given fraction of the recorded durations fall.
+		"""
+		if not self.count:
+			return 0
+		threshold = fraction * self.count
+		seen = 0
+		for bucket, bucketCount in enumerate(self.counts):
+			seen += bucketCount
+			if bucketCount and seen >= threshold:
+				return min(_bucketUpperBound(bucket), self.maxNanoseconds)
+		return self.maxNanoseconds
+
+	def reset(self):
+		self.__init__()
+
+
+#: The histogram of each timed function, by name.
+histograms: Dict[str, Histogram] = {}
+
+
+def _enterProfile():
+	global _profileDepth
+	if profiler is not None:
+		_profileDepth += 1
+		if _profileDepth == 1:
+			profiler.enable()
+
+
+def _exitProfile(profile):
+	global _profileDepth
+	if profile is not None:
+		_profileDepth -= 1
+		if _profileDepth == 0:
+			profile.disable()
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+	"""
+	Records the duration of each call to the decorated function in the histogram of the given name.
+	For generator functions, the time spent producing the items is recorded once the generator is exhausted or closed.
+	While a profiler is set, it profiles the outermost timed call, or each item production of a timed generator.
+	"""
+	histogram = histograms.setdefault(name, Histogram())
+
+	def decorator(func: Callable) -> Callable:
+		if inspect.isgeneratorfunction(func):
+			@functools.wraps(func)
+			def generatorWrapper(*args, **kwargs):
+				if not enabled and profiler is None:
+					return (yield from func(*args, **kwargs))
+				generator = func(*args, **kwargs)
+				elapsed = 0
+				try:
+					while True:
+						profile = profiler
+						_enterProfile()
+						start = perf_counter_ns()
+						try:
+							item = next(generator)
+						except StopIteration as e:
+							return e.value
+						finally:
+							elapsed += perf_counter_ns() - start
+							_exitProfile(profile)
+						yield item
+				finally:
+					generator.close()
+					if enabled:
+						histogram.record(elapsed)
+			return generatorWrapper
+
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			if not enabled and profiler is None:
+				return func(*args, **kwargs)
+			profile = profiler
+			_enterProfile()
+			start = perf_counter_ns()
+			try:
+				return func(*args, **kwargs)
+			finally:
+				elapsed = perf_counter_ns() - start
+				_exitProfile(profile)
+				if enabled:
+					histogram.record(elapsed)
+		return wrapper
+	return decorator
+
+
+def reset():
+	for histogram in histograms.values():
+		histogram.reset()
+
+
+def getReport() -> List[str]:
+	"""
+	@return: one line per timed function with its call count and latency percentiles, in microseconds.
+	"""
+	lines = [f"{'function':<40} {'calls':>8} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+	for name, histogram in sorted(histograms.items()):
+		if not histogram.count:
+			continue
+		mean = histogram.totalNanoseconds / histogram.count
+		lines.append(
+			f"{name:<40} {histogram.count:>8}"
+			f" {mean / 1000:>9.1f} {histogram.percentile(0.5) / 1000:>9.1f}"
+			f" {histogram.percentile(0.95) / 1000:>9.1f} {histogram.percentile(0.99) / 1000:>9.1f}"
+			f" {histogram.maxNanoseconds / 1000:>9.1f}"
+		)
+	return lines
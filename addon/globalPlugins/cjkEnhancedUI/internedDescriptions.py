@@ -0,0 +1,88 @@
+# internedDescriptions.py
+# Part of CJKEnhancedUI
+# A compact in memory description store, holding each distinct description once in a single string pool.
+
+from array import array
+from bisect import bisect_left
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	Optional,
+	Sequence,
+	Tuple,
+)
+
+
+class InternedDescriptions:
+	"""
+	Character descriptions stored as arrays of integers over a pool of distinct descriptions.
+	Descriptions repeated across entries are stored once, and no per entry tuple or string object is kept alive:
+	a lookup bisects the code points and slices the descriptions out of the pool.
+	"""
+
+	def __init__(self, entries: Iterable[Tuple[str, Sequence[str]]], locale: str = ""):
+		self.locale = locale
+		descriptionIds: Dict[str, int] = {}
+		poolParts = []
+		poolStarts = array("I", [0])
+		singles = []
+		self._extras: Dict[str, Tuple[str, ...]] = {}
+		for character, descriptions in entries:
+			if len(character) != 1:
+				self._extras[character] = tuple(descriptions)
+				continue
+			ids = []
+			for description in descriptions:
+				descriptionId = descriptionIds.get(description)
+				if descriptionId is None:
+					descriptionId = descriptionIds[description] = len(poolParts)
+					poolParts.append(description)
+					poolStarts.append(poolStarts[-1] + len(description))
+				ids.append(descriptionId)
+			singles.append((ord(character), ids))
+		singles.sort()
+		self._pool = "".join(poolParts)
+		self._poolStarts = poolStarts
+		self._codePoints = array("I", (codePoint for codePoint, _ids in singles))
+		self._entryStarts = array("I", [0])
+		self._descriptionIds = array("I")
+		for _codePoint, ids in singles:
+			self._descriptionIds.extend(ids)
+			self._entryStarts.append(len(self._descriptionIds))
+
+	def __len__(self) -> int:
+		return len(self._codePoints) + len(self._extras)
+
+	def _getDescriptions(self, entry: int) -> Tuple[str, ...]:
+		pool = self._pool
+		poolStarts = self._poolStarts
+		return tuple(
+			pool[poolStarts[descriptionId]:poolStarts[descriptionId + 1]]
+			for descriptionId in self._descriptionIds[self._entryStarts[entry]:self._entryStarts[entry + 1]]
+		)
+
+	def items(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+		"""
+		@return: every character and its descriptions.
+		"""
+		for entry, codePoint in enumerate(self._codePoints):
+			yield chr(codePoint), self._getDescriptions(entry)
+		yield from self._extras.items()
+
+	def getCharacterDescription(self, character: str) -> Optional[Tuple[str, ...]]:
+		"""
+		@param character: the character who's description should be retrieved.
+		@return: the descriptions for the character, or None if there is none.
+		"""
+		if len(character) != 1:
+			return self._extras.get(character)
+		codePoint = ord(character)
+		entry = bisect_left(self._codePoints, codePoint)
+		if entry == len(self._codePoints) or self._codePoints[entry] != codePoint:
+			return None
+		return self._getDescriptions(entry)
+
+	@property
+	def distinctDescriptions(self) -> int:
+		return len(self._poolStarts) - 1
@@ -0,0 +1,158 @@
+# linePrefetch.py
+# Part of CJKEnhancedUI
+# Resolves the review records of the line being reviewed, a window around the review cursor at a time.
+
+from typing import (
+	Callable,
+	List,
+	Optional,
+	Tuple,
+)
+
+import queueHandler
+import textUtils
+
+from . import descriptionIndex
+from .descriptionIndex import ReviewRecord
+
+
+class LinePrefetcher:
+	"""
+	Keeps the review records of the characters of the line being reviewed, by offset in the line.
+	Lines are identified by their object and offsets, so the text of a line is only fetched when the cursor enters it.
+	The records of a window around the review cursor are resolved on the event queue once the script which moved it has run,
+	and the next window is scheduled when the cursor nears the edge of the resolved ones,
+	so stepping through the line only reads the table and no event resolves more than a window.
+	Must be used from the main thread.
+	"""
+
+	def __init__(self, maxLineLength: int = 1000, windowSize: int = 64):
+		#: Lines longer than this are not prefetched, as their characters are unlikely to all be reviewed.
+		self.maxLineLength = maxLineLength
+		#: The number of records resolved by each event.
+		self.windowSize = windowSize
+		#: The locale and the start and end offsets of the line.
+		self._key: Optional[Tuple[str, int, int]] = None
+		#The object of the line is compared by identity, as comparing objects may query their application.
+		self._obj = None
+		self._lineText = ""
+		self._converter: Optional[textUtils.WideStringOffsetConverter] = None
+		self._records: List[Optional[ReviewRecord]] = []
+		self._pending: Optional[Tuple[int, int]] = None
+		self.hits = 0
+		self.misses = 0
+
+	def enterLine(
+			self,
+			obj,
+			lineStart: Optional[int],
+			lineEnd: Optional[int],
+			getLineText: Callable[[], str],
+			locale: str,
+			offset: Optional[int] = None,
+			wideOffsets: bool = False,
+	):
+		"""
+		Schedules the resolution of the records around the review cursor, unless they are already available.
+		@param obj: the object whose text the line is part of.
+		@param lineStart: the offset of the start of the line in its text,
+		or None if the text does not expose offsets, in which case nothing is prefetched.
+		@param lineEnd: the offset of the end of the line in its text.
+		@param getLineText: fetches the text of the line, only called when the cursor entered another line.
+		@param offset: the offset of the review cursor in the text, or None to start from the start of the line.
+		@param wideOffsets: whether offsets count UTF-16 code units rather than characters.
+		"""
+		if lineStart is None or lineEnd is None or lineEnd - lineStart > self.maxLineLength:
+			return
+		key = (locale, lineStart, lineEnd)
+		if key != self._key or obj is not self._obj:
+			lineText = getLineText()
+			self._key = key
+			self._obj = obj
+			self._lineText = lineText
+			self._converter = None
+			if wideOffsets:
+				converter = textUtils.WideStringOffsetConverter(lineText)
+				if converter.encodedStringLength != converter.strLength:
+					#Only characters outside the Basic Multilingual Plane take two code units.
+					self._converter = converter
+			self._records = [None] * len(lineText)
+			self._pending = None
+		index = self._getIndex(offset) if offset is not None else 0
+		if index is not None:
+			self._scheduleWindow(index)
+
+	def _getIndex(self, offset: int) -> Optional[int]:
+		"""
+		@return: the index in the line of the character at an offset of the text, or None if it is outside the line.
+		"""
+		index = offset - self._key[1]
+		if self._converter is not None:
+			if not 0 <= index <= self._converter.encodedStringLength:
+				return None
+			index = self._converter.encodedToStrOffsets(index, index)[0]
+		return index if 0 <= index < len(self._records) else None
+
+	def _scheduleWindow(self, index: int):
+		"""
+		Schedules the resolution of the window around a character of the line if part of it is unresolved.
+		"""
+		records = self._records
+		start = max(index - self.windowSize // 4, 0)
+		end = min(start + self.windowSize, len(records))
+		if None not in records[start:end]:
+			return
+		if self._pending is not None and self._pending[0] <= index < self._pending[1]:
+			return
+		self._pending = (start, end)
+		queueHandler.queueFunction(queueHandler.eventQueue, self._resolve, self._key, self._obj, start, end)
+
+	def _resolve(self, key: Tuple[str, int, int], obj, start: int, end: int):
+		if key != self._key or obj is not self._obj:
+			#The cursor entered another line before this window was resolved.
+			return
+		if self._pending == (start, end):
+			self._pending = None
+		locale = key[0]
+		lineText = self._lineText
+		records = self._records
+		for index in range(start, end):
+			if records[index] is None:
+				records[index] = descriptionIndex.getReviewRecord(locale, lineText[index].lower())
+
+	def getRecord(self, offset: Optional[int], character: str, locale: str) -> ReviewRecord:
+		"""
+		Fetches the review record of a character, from the line table when it covers the offset.
+		The line may have been edited since its text was fetched, so records are only used for the same character.
+		@param offset: the offset of the character in its text, or None if unknown.
+		@param character: the character, in lower case.
+		"""
+		if self._key is not None and offset is not None and self._key[0] == locale:
+			index = self._getIndex(offset)
+			if index is not None:
+				record = self._records[index]
+				self._scheduleWindow(index)
+				if record is not None and record.character == character:
+					self.hits += 1
+					return record
+		self.misses += 1
+		return descriptionIndex.getReviewRecord(locale, character)
+
+	def clear(self):
+		"""
+		Drops the line table, for when the records it holds may be outdated.
+		"""
+		self._key = None
+		self._obj = None
+		self._lineText = ""
+		self._records = []
+		self._pending = None
+
+	def stats(self) -> str:
+		"""
+		@return: a one line summary of the table counters, suitable for the log.
+		"""
+		lookups = self.hits + self.misses
+		hitRate = self.hits / lookups if lookups else 0.0
+		resolved = len(self._records) - self._records.count(None)
+		return f"{resolved} records, {self.hits} hits, {self.misses} misses ({hitRate:.1%} hit rate)"
@@ -0,0 +1,101 @@
+# lru.py
+# Part of CJKEnhancedUI
+# A bounded least recently used cache with hit, miss and eviction counters.
+
+from collections import OrderedDict
+import threading
+from typing import (
+	Any,
+	Callable,
+	Hashable,
+	Optional,
+)
+
+_MISSING = object()
+
+
+class LRUCache:
+	"""
+	A dictionary of at most maxSize entries which evicts the least recently used entry when full.
+	"""
+
+	def __init__(self, maxSize: int = 4096):
+		if maxSize < 1:
+			raise ValueError("maxSize must be at least 1")
+		self.maxSize = maxSize
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __contains__(self, key: Hashable) -> bool:
+		return key in self._entries
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		"""
+		Fetches an entry and marks it as the most recently used one.
+		"""
+		with self._lock:
+			try:
+				value = self._entries[key]
+			except KeyError:
+				self.misses += 1
+				return default
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return value
+
+	def put(self, key: Hashable, value: Any):
+		"""
+		Stores an entry, evicting the least recently used one if the cache is full.
+		"""
+		with self._lock:
+			self._entries[key] = value
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.maxSize:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+
+	def getOrCreate(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+		"""
+		Fetches an entry, creating and storing it with factory on a miss.
+		"""
+		value = self.get(key, _MISSING)
+		if value is _MISSING:
+			value = factory()
+			self.put(key, value)
+		return value
+
+	def evict(self, key: Hashable) -> Optional[Any]:
+		"""
+		Removes an entry if present.
+		@return: the removed value, or None if there was no entry for the key.
+		"""
+		with self._lock:
+			value = self._entries.pop(key, None)
+			if value is not None:
+				self.evictions += 1
+			return value
+
+	def clear(self):
+		"""
+		Removes every entry. The counters are kept so that they describe the whole session.
+		"""
+		with self._lock:
+			self.evictions += len(self._entries)
+			self._entries.clear()
+
+	def stats(self) -> str:
+		"""
+		@return: a one line summary of the cache counters, suitable for the log.
+		"""
+		lookups = self.hits + self.misses
+		hitRate = self.hits / lookups if lookups else 0.0
+		return (
+			f"{len(self._entries)}/{self.maxSize} entries, {self.hits} hits, {self.misses} misses"
+			f" ({hitRate:.1%} hit rate), {self.evictions} evictions"
+		)
@@ -0,0 +1,39 @@
+# paths.py
+# Part of CJKEnhancedUI
+# Locations of the files read and written by the add-on.
+
+import os
+
+import globalVars
+
+
+def getConfigDirectory() -> str:
+	"""
+	@return: the add-on's directory in NVDA's user configuration directory, created if needed.
+	"""
+	path = os.path.join(globalVars.appArgs.configPath, "CJKEnhancedUI")
+	os.makedirs(path, exist_ok=True)
+	return path
+
+
+def getCharacterDescriptionsFile(locale: str) -> str:
+	"""
+	@return: the path of NVDA's character descriptions dictionary for a locale, which may not exist.
+	"""
+	return os.path.join(globalVars.appDir, "locale", locale, "characterDescriptions.dic")
+
+
+def getPhrasesFile(locale: str) -> str:
+	"""
+	@return: the path of the user's phrase descriptions dictionary for a locale, which may not exist.
+	Its lines have the same tab separated format as NVDA's character descriptions dictionaries.
+	"""
+	return os.path.join(getConfigDirectory(), f"phrases-{locale}.dic")
+
+
+def getUserDescriptionsFile(locale: str) -> str:
+	"""
+	@return: the path of the user's character descriptions dictionary for a locale, which may not exist.
+	Its lines have the same tab separated format as NVDA's character descriptions dictionaries.
+	"""
+	return os.path.join(getConfigDirectory(), f"descriptions-{locale}.dic")
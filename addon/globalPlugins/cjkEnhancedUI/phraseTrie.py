@@ -0,0 +1,136 @@
+# phraseTrie.py
+# Part of CJKEnhancedUI
+# A prefix trie over a phrase dictionary, segmenting text into its longest known phrases in a single pass.
+
+import os
+import threading
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	Optional,
+	Sequence,
+	Tuple,
+)
+
+from logHandler import log
+
+from . import paths
+from .descriptionIndex import getLocaleChain
+
+
+class PhraseTrie:
+	"""
+	Phrases and their descriptions, with a prefix trie for segmenting text.
+	The trie is stored flat, as a single dictionary mapping (node, character) to the child node,
+	rather than as one dictionary per node.
+	"""
+
+	def __init__(self, phrases: Iterable[Tuple[str, Sequence[str]]] = ()):
+		self._children: Dict[Tuple[int, str], int] = {}
+		self._descriptions: Dict[str, Tuple[str, ...]] = {}
+		self._terminals = set()
+		self._nodeCount = 1
+		#: The length of the longest phrase, which bounds the work done at each position of a segmented text.
+		self.maxLength = 0
+		for phrase, descriptions in phrases:
+			self.add(phrase, descriptions)
+
+	def __len__(self) -> int:
+		return len(self._descriptions)
+
+	def add(self, phrase: str, descriptions: Sequence[str]):
+		"""
+		Adds a phrase of at least two characters, replacing the descriptions of an existing one.
+		"""
+		if len(phrase) < 2 or not descriptions:
+			return
+		children = self._children
+		node = 0
+		for character in phrase:
+			child = children.get((node, character))
+			if child is None:
+				child = children[(node, character)] = self._nodeCount
+				self._nodeCount += 1
+			node = child
+		self._terminals.add(node)
+		self._descriptions[phrase] = tuple(descriptions)
+		self.maxLength = max(self.maxLength, len(phrase))
+
+	def getDescription(self, phrase: str) -> Optional[Tuple[str, ...]]:
+		"""
+		@return: the descriptions of the phrase, or None if it is not in the dictionary.
+		"""
+		return self._descriptions.get(phrase)
+
+	def segment(self, text: str) -> Iterator[str]:
+		"""
+		Splits text into the longest phrases found at each position, scanning left to right,
+		and single characters where no phrase starts.
+		Each position is only walked as deep as the longest phrase, so this is linear in the length of the text.
+		"""
+		children = self._children
+		terminals = self._terminals
+		textLength = len(text)
+		start = 0
+		while start < textLength:
+			matchEnd = start+1
+			node = children.get((0, text[start]))
+			position = start+1
+			while node is not None:
+				if node in terminals:
+					matchEnd = position
+				if position == textLength:
+					break
+				node = children.get((node, text[position]))
+				position += 1
+			yield text[start:matchEnd]
+			start = matchEnd
+
+
+_tries: Dict[str, Optional[PhraseTrie]] = {}
+_triesLock = threading.Lock()
+
+
+def _buildTrie(locale: str) -> Optional[PhraseTrie]:
+	from .compiledDictionary import parseDictionary
+	trie = None
+	for candidate in reversed(getLocaleChain(locale)):
+		path = paths.getPhrasesFile(candidate)
+		if not os.path.isfile(path):
+			continue
+		try:
+			entries = parseDictionary(path)
+		except OSError:
+			log.error(f"Failed to read the phrase dictionary {path}", exc_info=True)
+			continue
+		if trie is None:
+			trie = PhraseTrie()
+		for phrase, descriptions in entries.items():
+			trie.add(phrase, descriptions)
+	if trie is not None:
+		log.debug(f"Loaded {len(trie)} phrases for {locale}, up to {trie.maxLength} characters long")
+	return trie
+
+
+def getPhraseTrie(locale: str) -> Optional[PhraseTrie]:
+	"""
+	Fetches the phrases available to a locale, loading them on first use.
+	@return: the phrases, or None if there is no phrase dictionary for the locale.
+	"""
+	try:
+		return _tries[locale]
+	except KeyError:
+		pass
+	with _triesLock:
+		if locale not in _tries:
+			_tries[locale] = _buildTrie(locale)
+		return _tries[locale]
+
+
+def invalidate():
+	"""
+	Discards the loaded phrases, so that they are read again on next use.
+	"""
+	with _triesLock:
+		_tries.clear()
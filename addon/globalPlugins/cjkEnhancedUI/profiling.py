@@ -0,0 +1,88 @@
+# profiling.py
+# Part of CJKEnhancedUI
+# Profiling sessions covering only the add-on's timed hooks and scripts, saved as pstats files.
+
+import cProfile
+import marshal
+import os
+import pstats
+import time
+from typing import Optional
+
+import core
+from logHandler import log
+
+from . import instrumentation, paths
+
+#: A session stops by itself after this many seconds.
+MAX_SECONDS = 120
+
+#: The size above which only the functions with the highest cumulative time are kept in the saved file.
+MAX_BYTES = 4 * 1024 * 1024
+
+_stopTimer = None
+_startTime = 0.0
+
+
+def isRunning() -> bool:
+	return instrumentation.profiler is not None
+
+
+def start(maxSeconds: int = MAX_SECONDS):
+	"""
+	Starts profiling the add-on's timed functions, until L{stop} is called or maxSeconds have elapsed.
+	Must be called from the main thread.
+	"""
+	global _stopTimer, _startTime
+	if isRunning():
+		return
+	_startTime = time.perf_counter()
+	instrumentation.profiler = cProfile.Profile()
+	_stopTimer = core.callLater(maxSeconds * 1000, _stopOnTimeout)
+	log.info(f"CJKEnhancedUI profiling started for at most {maxSeconds} s")
+
+
+def _stopOnTimeout():
+	global _stopTimer
+	_stopTimer = None
+	stop()
+
+
+def _capStats(stats: dict, maxBytes: int) -> dict:
+	"""
+	Drops the functions with the lowest cumulative time until the marshalled statistics fit in maxBytes.
+	"""
+	kept = len(stats)
+	while kept > 1 and len(marshal.dumps(stats)) > maxBytes:
+		kept //= 2
+		#The entries are (call count, primitive call count, total time, cumulative time, callers).
+		stats = dict(sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:kept])
+	return stats
+
+
+def stop(maxBytes: int = MAX_BYTES) -> Optional[str]:
+	"""
+	Stops profiling and saves the statistics to a pstats file in the add-on's configuration directory.
+	The file can be read with the pstats module or viewers such as snakeviz.
+	@return: the path of the file, or None if no session was running or nothing was profiled.
+	"""
+	global _stopTimer
+	profile = instrumentation.profiler
+	if profile is None:
+		return None
+	instrumentation.profiler = None
+	profile.disable()
+	if _stopTimer is not None:
+		_stopTimer.Stop()
+		_stopTimer = None
+	duration = time.perf_counter() - _startTime
+	profile.create_stats()
+	if not profile.stats:
+		log.info("CJKEnhancedUI profiling stopped, nothing was profiled")
+		return None
+	stats = pstats.Stats(profile)
+	stats.stats = _capStats(stats.stats, maxBytes)
+	path = os.path.join(paths.getConfigDirectory(), time.strftime("profile-%Y%m%d-%H%M%S.pstats"))
+	stats.dump_stats(path)
+	log.info(f"CJKEnhancedUI profiling stopped after {duration:.1f} s, {len(stats.stats)} functions saved to {path}")
+	return path
@@ -0,0 +1,210 @@
+# readingIndex.py
+# Part of CJKEnhancedUI
+# Readings of Han characters, Zhuyin or Pinyin, stored in one shard per Unicode block and loaded on first use.
+#
+# The shards are built from the Unihan database by tools/buildReadings.py, as readings/<system>/<block>.tsv files
+# next to this module. Their lines hold the hexadecimal code point of a character and its readings, tab separated:
+# 4E2D	ㄓㄨㄥ ㄓㄨㄥˋ
+# A shard is only read when a character of its block is first looked up, so reviewing common characters
+# never loads the large shards of the extension blocks.
+
+from array import array
+from bisect import bisect_right
+import codecs
+import os
+import sys
+import threading
+import time
+from typing import (
+	Dict,
+	Iterable,
+	NamedTuple,
+	Optional,
+	Tuple,
+)
+
+from logHandler import log
+
+#: The directory the shards are read from.
+READINGS_DIRECTORY = os.path.join(os.path.dirname(__file__), "readings")
+
+#: The reading system used for each locale. Other locales have no readings.
+READING_SYSTEMS = {
+	"zh_TW": "zhuyin",
+	"zh_CN": "pinyin",
+}
+
+
+class Block(NamedTuple):
+	"""
+	A Unicode block of Han characters, with the reading shard covering it.
+	"""
+	#: The name of the shard files of the block.
+	name: str
+	first: int
+	last: int
+
+	def __len__(self) -> int:
+		return self.last - self.first + 1
+
+
+#: The blocks readings are sharded by, in code point order.
+BLOCKS = (
+	Block("extA", 0x3400, 0x4DBF),
+	Block("unified", 0x4E00, 0x9FFF),
+	Block("compatibility", 0xF900, 0xFAFF),
+	Block("extB", 0x20000, 0x2A6DF),
+	Block("extC", 0x2A700, 0x2B73F),
+	Block("extD", 0x2B740, 0x2B81F),
+	Block("extE", 0x2B820, 0x2CEAF),
+	Block("extF", 0x2CEB0, 0x2EBEF),
+	Block("extG", 0x30000, 0x3134F),
+	Block("extH", 0x31350, 0x323AF),
+)
+
+_blockStarts = [block.first for block in BLOCKS]
+
+
+def getBlock(codePoint: int) -> Optional[Block]:
+	"""
+	@return: the block of a code point, or None if it is in none of L{BLOCKS}.
+	"""
+	position = bisect_right(_blockStarts, codePoint) - 1
+	if position < 0:
+		return None
+	block = BLOCKS[position]
+	return block if codePoint <= block.last else None
+
+
+def getShardFile(system: str, block: Block) -> str:
+	return os.path.join(READINGS_DIRECTORY, system, f"{block.name}.tsv")
+
+
+class ReadingShard:
+	"""
+	The readings of the characters of one block.
+	Each code point of the block maps through an array to an entry of a tuple of distinct readings,
+	so a lookup is an index into the array and characters sharing readings share their string.
+	"""
+
+	def __init__(self, block: Block, lines: Iterable[str]):
+		self.block = block
+		readingIds: Dict[str, int] = {}
+		ids = [0] * len(block)
+		for line in lines:
+			if line.isspace() or line.startswith("#"):
+				continue
+			codePoint, reading = line.rstrip("\r\n").split("\t", 1)
+			offset = int(codePoint, 16) - block.first
+			if 0 <= offset < len(ids) and reading:
+				#Id 0 is kept for characters without a reading.
+				ids[offset] = readingIds.setdefault(reading, len(readingIds) + 1)
+		self._readings: Tuple[Optional[str], ...] = (None,) + tuple(readingIds)
+		self._ids = array("H" if len(self._readings) <= 0xFFFF else "I", ids)
+		#: The number of characters with a reading.
+		self.count = len(ids) - ids.count(0)
+
+	def getReading(self, codePoint: int) -> Optional[str]:
+		return self._readings[self._ids[codePoint - self.block.first]]
+
+	@property
+	def distinctReadings(self) -> int:
+		return len(self._readings) - 1
+
+
+class ShardStats(NamedTuple):
+	#: The number of characters with a reading.
+	count: int
+	#: The time taken to read and build the shard, in milliseconds.
+	loadTime: float
+	#: The bytes held by the shard's array and distinct readings.
+	size: int
+
+
+_shards: Dict[Tuple[str, str], Optional[ReadingShard]] = {}
+#: The statistics of the loaded shards, keyed by (reading system, block name).
+shardStats: Dict[Tuple[str, str], ShardStats] = {}
+_shardsLock = threading.Lock()
+
+
+def _measure(shard: ReadingShard) -> int:
+	return (
+		sys.getsizeof(shard._ids) + sys.getsizeof(shard._readings)
+		+ sum(sys.getsizeof(reading) for reading in shard._readings if reading is not None)
+	)
+
+
+def _loadShard(system: str, block: Block) -> Optional[ReadingShard]:
+	path = getShardFile(system, block)
+	if not os.path.isfile(path):
+		return None
+	start = time.perf_counter()
+	try:
+		with codecs.open(path, "r", "utf_8_sig") as f:
+			shard = ReadingShard(block, f)
+	except Exception:
+		log.error(f"Failed to load the {system} readings of {block.name} from {path}", exc_info=True)
+		return None
+	stats = ShardStats(shard.count, (time.perf_counter() - start) * 1000, _measure(shard))
+	shardStats[(system, block.name)] = stats
+	log.debug(
+		f"Loaded {stats.count} {system} readings of {block.name} in {stats.loadTime:.1f} ms,"
+		f" {stats.size} bytes"
+	)
+	return shard
+
+
+def getShard(system: str, block: Block) -> Optional[ReadingShard]:
+	"""
+	Fetches the shard of a block, reading it on first use.
+	@return: the shard, or None if it was not built.
+	"""
+	key = (system, block.name)
+	try:
+		return _shards[key]
+	except KeyError:
+		pass
+	with _shardsLock:
+		if key not in _shards:
+			_shards[key] = _loadShard(system, block)
+		return _shards[key]
+
+
+def getReading(locale: str, character: str) -> Optional[str]:
+	"""
+	@param locale: the locale (language[_COUNTRY]) whose reading system should be used.
+	@param character: the character who's reading should be retrieved.
+	@return: the readings of the character separated by spaces, or None if there are none.
+	"""
+	system = READING_SYSTEMS.get(locale)
+	if system is None or len(character) != 1:
+		return None
+	codePoint = ord(character)
+	block = getBlock(codePoint)
+	if block is None:
+		return None
+	shard = getShard(system, block)
+	if shard is None:
+		return None
+	return shard.getReading(codePoint)
+
+
+def stats() -> str:
+	"""
+	@return: the number of readings, load time and size of every loaded shard.
+	"""
+	if not shardStats:
+		return "no shard loaded"
+	return ", ".join(
+		f"{system}/{name}: {shardStats.count} readings, {shardStats.loadTime:.1f} ms, {shardStats.size} bytes"
+		for (system, name), shardStats in sorted(shardStats.items())
+	)
+
+
+def invalidate():
+	"""
+	Drops every loaded shard, so that they are read again on next use.
+	"""
+	with _shardsLock:
+		_shards.clear()
+		shardStats.clear()
@@ -0,0 +1,299 @@
+# reverseIndex.py
+# Part of CJKEnhancedUI
+# An n-gram inverted index over character descriptions, for finding characters by the text of their descriptions.
+
+from array import array
+from bisect import bisect_left, bisect_right
+import heapq
+import threading
+import time
+from typing import (
+	Callable,
+	Dict,
+	Iterable,
+	Iterator,
+	List,
+	NamedTuple,
+	Optional,
+	Sequence,
+	Set,
+	Tuple,
+)
+
+from logHandler import log
+
+from . import descriptionIndex
+
+
+class ReverseMatch(NamedTuple):
+	#: The character, or multi character entry, whose descriptions contain the searched text.
+	character: str
+	#: All the descriptions of the character.
+	descriptions: Tuple[str, ...]
+	#: The first description containing the searched text.
+	description: str
+
+
+def _getGrams(text: str) -> Set[int]:
+	"""
+	@return: the codes of the bigrams of the text, or of the text itself if it is a single character.
+	"""
+	if len(text) == 1:
+		return {ord(text)}
+	#Code points take 21 bits, so shifting the first one past them keeps bigram codes above single character codes.
+	codes = list(map(ord, text))
+	return {(first + 1) << 21 | second for first, second in zip(codes, codes[1:])}
+
+
+#: Searches whose rarest gram lists more entries than this walk the descriptions in rank order instead,
+#: stopping once enough matches are found, rather than ranking every listed entry.
+MAX_VERIFIED_CANDIDATES = 1024
+
+#: Separates the descriptions of the rank ordered texts. Descriptions are read from lines, so never contain it.
+SEPARATOR = "\n"
+
+
+def _getRank(descriptions: Sequence[str], query: str, entry: int) -> Optional[Tuple[int, ...]]:
+	"""
+	@return: the rank of an entry for a query, lower first, or None if none of its descriptions contains the query.
+	Descriptions equal to the query rank first, then those starting with it,
+	then matches in an earlier description of the entry, then matches in a shorter description.
+	"""
+	for position, description in enumerate(descriptions):
+		offset = description.find(query)
+		if offset >= 0:
+			return (description != query, offset != 0, position, len(description), entry)
+	return None
+
+
+def _intersect(entries: array, postings: List[Tuple[int, int]]) -> List[int]:
+	"""
+	@param entries: the posting lists of every gram, one after the other.
+	@param postings: the start and end of sorted posting lists in the entries, shortest first.
+	@return: the entries listed in every posting list, in increasing order.
+	"""
+	start, end = postings[0]
+	candidates = list(entries[start:end])
+	for low, size in postings[1:]:
+		kept = []
+		for entry in candidates:
+			#Candidates are increasing, so each one is searched for after the previous one.
+			low = bisect_left(entries, entry, low, size)
+			if low == size:
+				break
+			if entries[low] == entry:
+				kept.append(entry)
+		candidates = kept
+		if not candidates:
+			break
+	return candidates
+
+
+class _RankedDescriptions(NamedTuple):
+	"""
+	The descriptions found at one position of the entries, ordered by length and then entry,
+	joined into a single text so that they can be searched in that order without visiting each one.
+	"""
+	#: The descriptions, each preceded and followed by L{SEPARATOR}.
+	text: str
+	#: The offset of each description in the text.
+	starts: array
+	#: The entry of each description.
+	entries: array
+
+
+class ReverseIndex:
+	"""
+	Maps every character and bigram found in descriptions to the entries whose descriptions contain it.
+	A search intersects the entries listed under every gram of the searched text, rarest first,
+	and only ranks the entries left, rather than scanning every description.
+	When even the rarest gram is common, the descriptions are searched in rank order instead,
+	so that the search stops at the requested number of matches.
+	"""
+
+	def __init__(self, entries: Iterable[Tuple[str, Tuple[str, ...]]]):
+		self._characters: List[str] = []
+		self._descriptions: List[Tuple[str, ...]] = []
+		postings: Dict[int, List[int]] = {}
+		positions: List[List[Tuple[int, int, str]]] = []
+		for character, descriptions in entries:
+			entry = len(self._characters)
+			self._characters.append(character)
+			self._descriptions.append(descriptions)
+			grams = set()
+			for position, description in enumerate(descriptions):
+				grams.update(map(ord, description))
+				grams.update(_getGrams(description))
+				if position == len(positions):
+					positions.append([])
+				positions[position].append((len(description), entry, description))
+			for gram in grams:
+				postings.setdefault(gram, []).append(entry)
+		#Most grams are listed by a single entry, so rather than an object per gram,
+		#the posting lists are stored one after the other in a single array, found by searching the sorted gram codes.
+		self._grams = array("Q", sorted(postings))
+		self._postingStarts = array("I")
+		self._postingEntries = array("I")
+		for gram in self._grams:
+			self._postingStarts.append(len(self._postingEntries))
+			#Entry numbers are appended in increasing order, so the posting lists are sorted.
+			self._postingEntries.extend(postings[gram])
+		self._postingStarts.append(len(self._postingEntries))
+		del postings
+		self._ranked: List[_RankedDescriptions] = []
+		for descriptions in positions:
+			descriptions.sort()
+			starts = array("I")
+			offset = 1
+			for length, _entry, _description in descriptions:
+				starts.append(offset)
+				offset += length + 1
+			text = SEPARATOR + SEPARATOR.join(description for _length, _entry, description in descriptions) + SEPARATOR
+			self._ranked.append(_RankedDescriptions(text, starts, array("I", (entry for _length, entry, _description in descriptions))))
+
+	def __len__(self) -> int:
+		return len(self._characters)
+
+	def search(self, query: str, limit: int = 50) -> List[ReverseMatch]:
+		"""
+		Finds the entries with a description containing the query.
+		Descriptions equal to the query rank first, then those starting with it,
+		then matches in an earlier description of the entry, then matches in a shorter description.
+		@param limit: the maximum number of matches returned.
+		"""
+		query = query.strip()
+		if not query or SEPARATOR in query:
+			return []
+		postings = []
+		for gram in _getGrams(query):
+			posting = self._getPosting(gram)
+			if posting is None:
+				return []
+			postings.append(posting)
+		postings.sort(key=lambda posting: posting[1] - posting[0])
+		if postings[0][1] - postings[0][0] > MAX_VERIFIED_CANDIDATES:
+			return self._searchInRankOrder(query, limit)
+		descriptions = self._descriptions
+		ranks = (_getRank(descriptions[entry], query, entry) for entry in _intersect(self._postingEntries, postings))
+		return [
+			ReverseMatch(self._characters[rank[-1]], descriptions[rank[-1]], descriptions[rank[-1]][rank[2]])
+			for rank in heapq.nsmallest(limit, filter(None, ranks))
+		]
+
+	def _getPosting(self, gram: int) -> Optional[Tuple[int, int]]:
+		"""
+		@return: the start and end of the posting list of a gram in the posting entries, or None if no entry lists it.
+		"""
+		grams = self._grams
+		index = bisect_left(grams, gram)
+		if index == len(grams) or grams[index] != gram:
+			return None
+		return self._postingStarts[index], self._postingStarts[index + 1]
+
+	def _searchInRankOrder(self, query: str, limit: int) -> List[ReverseMatch]:
+		matches = []
+		#Descriptions equal to the query, then starting with it, then containing it.
+		for needle in (SEPARATOR + query + SEPARATOR, SEPARATOR + query, query):
+			for match in self._findInRankOrder(query, needle):
+				matches.append(match)
+				if len(matches) == limit:
+					return matches
+		return matches
+
+	def _findInRankOrder(self, query: str, needle: str) -> Iterator[ReverseMatch]:
+		"""
+		Finds the descriptions containing the needle, in rank order, keeping only those whose rank tier the needle is for
+		and which are the first description of their entry to contain the query.
+		"""
+		isPrefix = needle[0] == SEPARATOR
+		isExact = isPrefix and needle[-1] == SEPARATOR
+		for position, (text, starts, entries) in enumerate(self._ranked):
+			size = len(starts)
+			index = text.find(needle)
+			while index >= 0:
+				item = bisect_right(starts, index + isPrefix) - 1
+				start = starts[item]
+				if isExact or (
+					text[start + len(query)] != SEPARATOR if isPrefix else not text.startswith(query, start)
+				):
+					entry = entries[item]
+					descriptions = self._descriptions[entry]
+					if not any(query in description for description in descriptions[:position]):
+						yield ReverseMatch(self._characters[entry], descriptions, descriptions[position])
+				#Search from the separator before the next description, which the needle may start with.
+				index = text.find(needle, starts[item + 1] - 1) if item + 1 < size else -1
+
+
+_reverseIndexes: Dict[str, ReverseIndex] = {}
+#: Guards _reverseIndexes and _buildLocks, only held for lookups and stores, never while an index is built.
+_reverseIndexesLock = threading.Lock()
+#: Serializes the builds of each locale, so that a build is waited for rather than repeated.
+_buildLocks: Dict[str, threading.Lock] = {}
+#: Incremented by L{invalidate}, so that indexes built meanwhile from outdated descriptions are not kept.
+_generation = 0
+
+
+def getReverseIndex(locale: str) -> ReverseIndex:
+	"""
+	Fetches the reverse index over the descriptions available to a locale, building it on first use.
+	The descriptions are those of L{descriptionIndex.iterDescriptions}, which merges the locale's fallback chain
+	and the user's descriptions the same way the review modes resolve descriptions.
+	"""
+	index = _reverseIndexes.get(locale)
+	if index is not None:
+		return index
+	with _reverseIndexesLock:
+		buildLock = _buildLocks.setdefault(locale, threading.Lock())
+	with buildLock:
+		index = _reverseIndexes.get(locale)
+		if index is None:
+			generation = _generation
+			start = time.perf_counter()
+			index = ReverseIndex(descriptionIndex.iterDescriptions(locale))
+			log.debug(
+				f"Built the reverse description index for {locale}: {len(index)} entries"
+				f" in {(time.perf_counter() - start) * 1000:.1f} ms"
+			)
+			with _reverseIndexesLock:
+				if generation == _generation:
+					_reverseIndexes[locale] = index
+	return index
+
+
+def getBuiltReverseIndex(locale: str) -> Optional[ReverseIndex]:
+	"""
+	@return: the reverse index of a locale if it was built, without building it.
+	"""
+	return _reverseIndexes.get(locale)
+
+
+def warmUp(locale: str, callback: Optional[Callable[[], None]] = None) -> threading.Thread:
+	"""
+	Builds the reverse index of a locale on a background thread, which takes seconds for the CJK locales.
+	A build already in progress is waited for rather than repeated.
+	@param callback: called on the background thread once the index is built.
+	@return: the started thread.
+	"""
+	def run():
+		try:
+			getReverseIndex(locale)
+		except Exception:
+			log.error(f"Failed to build the reverse description index for {locale}", exc_info=True)
+			return
+		if callback is not None:
+			callback()
+
+	thread = threading.Thread(target=run, name="CJKEnhancedUI.reverseIndexWarmUp", daemon=True)
+	thread.start()
+	return thread
+
+
+def invalidate():
+	"""
+	Discards the reverse indexes, so that they are rebuilt from the current descriptions on next use.
+	Builds in progress complete, but their indexes are not kept.
+	"""
+	global _generation
+	with _reverseIndexesLock:
+		_reverseIndexes.clear()
+		_generation += 1
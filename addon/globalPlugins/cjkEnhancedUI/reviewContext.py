@@ -0,0 +1,88 @@
+# reviewContext.py
+# Part of CJKEnhancedUI
+# The state of character description review: the immutable context of a spelling request,
+# and the shared cursor enumerating the descriptions of the reviewed character.
+
+import contextlib
+import contextvars
+import threading
+from typing import (
+	Iterator,
+	NamedTuple,
+	Tuple,
+)
+
+
+class ReviewContext(NamedTuple):
+	"""
+	Describes why text is being spelled. It is captured once per spelling request and passed down the spelling path.
+	"""
+	#: The direction in which the descriptions of the character are enumerated: 1 forward, -1 backward, 0 not enumerating.
+	direction: int = 0
+	#: Whether the text is spelled by the current character review scripts.
+	isReviewCharacter: bool = False
+
+
+#: The context of spelling which is not requested by the review scripts.
+DEFAULT_CONTEXT = ReviewContext()
+
+_currentContext = contextvars.ContextVar("CJKEnhancedUI.reviewContext", default=DEFAULT_CONTEXT)
+
+
+def getReviewContext() -> ReviewContext:
+	"""
+	@return: the context set by L{reviewing} in the current thread, or L{DEFAULT_CONTEXT}.
+	"""
+	return _currentContext.get()
+
+
+@contextlib.contextmanager
+def reviewing(direction: int) -> Iterator[ReviewContext]:
+	"""
+	Sets the context of spelling requested by the current character review scripts, for the current thread only.
+	NVDA's spelling functions can not pass it to the add-on's getSpellingSpeech, so it is read from there.
+	"""
+	context = ReviewContext(direction=direction, isReviewCharacter=True)
+	token = _currentContext.set(context)
+	try:
+		yield context
+	finally:
+		_currentContext.reset(token)
+
+
+class DescriptionCursor:
+	"""
+	The position in the description cycle of the character whose description was spoken last.
+	Each update is atomic, so descriptions can be resolved from several threads without corrupting the cycle.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._character = ""
+		self._index = 0
+
+	def step(self, character: str, direction: int, cycleLength: int) -> Tuple[bool, int]:
+		"""
+		Moves through the descriptions of a character in the given direction when it is the one reviewed last,
+		and starts over from its first description otherwise.
+		@param cycleLength: the number of entries in the description cycle of the character.
+		@return: whether the cycle started over, and the position of the description to speak.
+		"""
+		with self._lock:
+			if direction != 0 and self._character == character:
+				#Handle looping between beginning and end of the list.
+				self._index += direction
+				if abs(self._index) == cycleLength:
+					self._index = 0
+				return False, self._index
+			self._character = character
+			self._index = 0
+			return True, 0
+
+	def reset(self):
+		"""
+		Forgets the character reviewed last, so that its first description is spoken when it is reviewed again.
+		"""
+		with self._lock:
+			self._character = ""
+			self._index = 0
@@ -0,0 +1,89 @@
+# scheduling.py
+# Part of CJKEnhancedUI
+# Helpers which coalesce bursts of output into a single delivery.
+
+import threading
+from typing import (
+	Any,
+	Callable,
+	Optional,
+	Tuple,
+)
+
+import core
+import queueHandler
+
+
+class Debouncer:
+	"""
+	Delivers a value only once no newer value has been scheduled for a delay.
+	Values replaced before their delay expires are dropped and counted.
+	Must be used from the main thread, as it relies on wx timers.
+	"""
+
+	def __init__(self, callback: Callable[[Any], None]):
+		self._callback = callback
+		self._timer = None
+		self._pending: Optional[Any] = None
+		#: The number of values replaced by a newer one before being delivered.
+		self.dropped = 0
+
+	def schedule(self, value: Any, delay: int):
+		"""
+		@param value: the value to deliver to the callback.
+		@param delay: the time in milliseconds without newer values after which the value is delivered.
+		If 0, the value is delivered immediately.
+		"""
+		self.cancel()
+		if delay <= 0:
+			self._callback(value)
+			return
+		self._pending = value
+		self._timer = core.callLater(delay, self._deliver)
+
+	def cancel(self):
+		"""
+		Drops the pending value, if any.
+		"""
+		if self._timer is not None:
+			self._timer.Stop()
+			self._timer = None
+			self.dropped += 1
+		self._pending = None
+
+	def _deliver(self):
+		value = self._pending
+		self._timer = None
+		self._pending = None
+		self._callback(value)
+
+
+class LatestOnlyQueue:
+	"""
+	Queues functions to an NVDA queue, keeping at most one of them pending.
+	A function queued while another is still pending replaces it, and the replaced one is counted as dropped.
+	"""
+
+	def __init__(self, queue):
+		self._queue = queue
+		self._pending: Optional[Tuple[Callable, tuple, dict]] = None
+		self._lock = threading.Lock()
+		#: The number of queued functions replaced by a newer one before running.
+		self.dropped = 0
+
+	def queueFunction(self, func: Callable, *args, **kwargs):
+		with self._lock:
+			isQueued = self._pending is not None
+			if isQueued:
+				self.dropped += 1
+			self._pending = (func, args, kwargs)
+		if not isQueued:
+			queueHandler.queueFunction(self._queue, self._runPending)
+
+	def _runPending(self):
+		with self._lock:
+			pending = self._pending
+			self._pending = None
+		if pending is not None:
+			func, args, kwargs = pending
+			func(*args, **kwargs)
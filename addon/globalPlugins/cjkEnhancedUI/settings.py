@@ -0,0 +1,77 @@
+# settings.py
+# Part of CJKEnhancedUI
+# A snapshot of the add-on's configuration values read on every spelled or reviewed character,
+# and the speech settings read once per spelling request.
+
+from typing import NamedTuple
+
+import addonHandler
+import config
+from languageHandler import getLanguage
+import synthDriverHandler
+
+addonHandler.initTranslation()
+
+
+class SettingsSnapshot:
+	"""
+	Plain attribute copies of the add-on's configuration values used by the hot paths,
+	so that they do not walk the configuration profiles for every character.
+	The snapshot must be refreshed whenever the add-on's configuration may have changed.
+	NVDA's speech settings change from its settings dialogs without notifying the add-on,
+	so they are read by L{readSpeechSettings} instead.
+	"""
+	__slots__ = (
+		"locale",
+		"speechReview",
+		"brailleReview",
+		"spellingChunkSize",
+		"brailleReviewDelay",
+		"phraseReview",
+	)
+
+	def refresh(self):
+		self.locale = _(getLanguage())	#Stores the locale of NVDA.
+		addonConfig = config.conf["CJKEnhancedUI"]
+		self.speechReview = addonConfig["speechReview"]
+		self.brailleReview = addonConfig["brailleReview"]
+		self.spellingChunkSize = addonConfig["spellingChunkSize"]
+		self.brailleReviewDelay = addonConfig["brailleReviewDelay"]
+		self.phraseReview = addonConfig["phraseReview"]
+
+	@property
+	def isBrailleReviewEnabled(self) -> bool:
+		return self.brailleReview == "On" or self.brailleReview == "Auto"
+
+
+class SpeechSettings(NamedTuple):
+	"""
+	The speech and synthesizer settings spelling depends on.
+	"""
+	autoLanguageSwitching: bool
+	autoDialectSwitching: bool
+	capPitchChange: int
+	sayCapForCapitals: bool
+	beepForCapitals: bool
+	useSpellingFunctionality: bool
+
+
+def readSpeechSettings() -> SpeechSettings:
+	"""
+	Reads the current speech settings, once at the start of each spelling request.
+	"""
+	speechConfig = config.conf["speech"]
+	autoLanguageSwitching = speechConfig["autoLanguageSwitching"]
+	autoDialectSwitching = speechConfig["autoDialectSwitching"]
+	synth = synthDriverHandler.getSynth()
+	if synth is None:
+		return SpeechSettings(autoLanguageSwitching, autoDialectSwitching, 0, False, False, False)
+	synthConfig = speechConfig[synth.name]
+	return SpeechSettings(
+		autoLanguageSwitching,
+		autoDialectSwitching,
+		synthConfig["capPitchChange"] if synth.isSupported("pitch") else 0,
+		synthConfig["sayCapForCapitals"],
+		synthConfig["beepForCapitals"],
+		synthConfig["useSpellingFunctionality"],
+	)
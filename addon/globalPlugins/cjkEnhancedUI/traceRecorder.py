@@ -0,0 +1,122 @@
+# traceRecorder.py
+# Part of CJKEnhancedUI
+# An opt-in recorder of the inputs reaching the add-on's hooks and review scripts, for replaying them offline.
+#
+# A trace is a UTF-8 file with one JSON object per line. The first line is a header holding the format version,
+# the locale and the review settings. Every other line is an event with its kind "e" and its time "t",
+# in milliseconds since recording started:
+# "update": a braille region update, with the region's raw "text" and cursor position "pos"
+# "composition": an input composition update, with the "old" and "new" composition strings
+# "spelling": spelled "text", with its "locale" and whether character descriptions were requested ("desc")
+# "script": a review script "name", with the reviewed "text", and the "line" and "offset" in it when known
+# Events caused by a recorded review script are marked "nested", as replaying the script causes them again.
+# Traces contain the text the user read and typed, so they are only written when recording is started explicitly.
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import (
+	Any,
+	Callable,
+	Dict,
+	Optional,
+)
+
+from logHandler import log
+
+from . import paths
+
+TRACE_VERSION = 1
+
+#: Recording stops by itself once a trace reaches this size.
+MAX_TRACE_BYTES = 64 * 1024 * 1024
+
+#: Whether events are recorded. When False, the hooks only pay for checking this flag.
+recording = False
+
+_lock = threading.Lock()
+_file = None
+_path: Optional[str] = None
+_startTime = 0
+_writtenBytes = 0
+_scriptDepth = 0
+
+
+def start(header: Dict[str, Any]) -> str:
+	"""
+	Starts recording to a new trace file in the add-on's configuration directory.
+	@param header: the settings the events are recorded with, written on the first line.
+	@return: the path of the trace file.
+	"""
+	global recording, _file, _path, _startTime, _writtenBytes
+	stop()
+	path = os.path.join(paths.getConfigDirectory(), time.strftime("trace-%Y%m%d-%H%M%S.jsonl"))
+	with _lock:
+		_file = open(path, "w", encoding="utf-8", buffering=1 << 16)
+		_path = path
+		_startTime = time.perf_counter_ns()
+		_writtenBytes = 0
+		_write(dict(header, e="header", version=TRACE_VERSION))
+		recording = True
+	log.info(f"CJKEnhancedUI trace recording started: {path}")
+	return path
+
+
+def stop() -> Optional[str]:
+	"""
+	Stops recording and closes the trace file.
+	@return: the path of the trace file, or None if nothing was being recorded.
+	"""
+	global recording, _file
+	with _lock:
+		recording = False
+		if _file is None:
+			return None
+		_file.close()
+		_file = None
+	log.info(f"CJKEnhancedUI trace recording stopped: {_path}, {_writtenBytes} bytes")
+	return _path
+
+
+def _write(event: Dict[str, Any]):
+	global _writtenBytes
+	line = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+	_file.write(line)
+	_writtenBytes += len(line)
+
+
+def record(kind: str, **fields):
+	"""
+	Appends an event to the trace. Callers check L{recording} first, so that nothing is built when not recording.
+	"""
+	with _lock:
+		if _file is None:
+			return
+		fields["e"] = kind
+		if _scriptDepth and kind != "script":
+			fields["nested"] = True
+		fields["t"] = (time.perf_counter_ns() - _startTime) // 1000 / 1000
+		_write(fields)
+		isFull = _writtenBytes >= MAX_TRACE_BYTES
+	if isFull:
+		log.warning(f"CJKEnhancedUI trace reached {MAX_TRACE_BYTES} bytes")
+		stop()
+
+
+def scriptScope(func: Callable) -> Callable:
+	"""
+	Marks the events recorded while the decorated review script runs as nested in it.
+	"""
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs):
+		global _scriptDepth
+		if not recording:
+			return func(*args, **kwargs)
+		_scriptDepth += 1
+		try:
+			return func(*args, **kwargs)
+		finally:
+			_scriptDepth -= 1
+	return wrapper
@@ -0,0 +1,161 @@
+# userDescriptions.py
+# Part of CJKEnhancedUI
+# The user's own character descriptions, consulted before NVDA's and reloaded entry by entry when edited.
+#
+# The overlay of a locale is read from descriptions-<locale>.dic files in the add-on's configuration directory,
+# for the locale, its language and the fallback locale, the more specific files overriding the others.
+# Their lines have the tab separated format of NVDA's character descriptions dictionaries.
+# The descriptions of a line are spoken before NVDA's, or instead of them when the first one is "=":
+# 中	中央的中
+# 中	=	中央的中	中間的中
+
+import os
+import threading
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	Optional,
+	Set,
+	Tuple,
+)
+
+from logHandler import log
+
+from . import compiledDictionary, paths
+
+#: The first description of an entry whose descriptions replace NVDA's rather than preceding them.
+REPLACE_MARKER = "="
+
+#: An entry of an overlay: whether it replaces NVDA's descriptions, and its descriptions.
+OverlayEntry = Tuple[bool, Tuple[str, ...]]
+
+#: The overlays loaded so far, keyed by locale.
+_overlays: Dict[str, Dict[str, OverlayEntry]] = {}
+#: The size and modification time of the files each overlay was read from, keyed by locale.
+_stamps: Dict[str, Tuple] = {}
+_lock = threading.Lock()
+
+
+def _getSources(locale: str):
+	#descriptionIndex imports this module, so it is imported when first needed.
+	from .descriptionIndex import getLocaleChain
+	return [paths.getUserDescriptionsFile(candidate) for candidate in reversed(getLocaleChain(locale))]
+
+
+def _stampSources(sources) -> Tuple:
+	stamps = []
+	for path in sources:
+		try:
+			stat = os.stat(path)
+		except OSError:
+			stamps.append(None)
+		else:
+			stamps.append((stat.st_size, stat.st_mtime_ns))
+	return tuple(stamps)
+
+
+def _readOverlay(sources) -> Dict[str, OverlayEntry]:
+	overlay: Dict[str, OverlayEntry] = {}
+	for path in sources:
+		if not os.path.isfile(path):
+			continue
+		try:
+			entries = compiledDictionary.parseDictionary(path)
+		except Exception:
+			log.error(f"Failed to read user character descriptions from {path}", exc_info=True)
+			continue
+		for character, descriptions in entries.items():
+			replace = descriptions[0] == REPLACE_MARKER
+			if replace:
+				descriptions = descriptions[1:]
+			overlay[character] = (replace, tuple(description for description in descriptions if description))
+	return overlay
+
+
+def getOverlay(locale: str) -> Dict[str, OverlayEntry]:
+	"""
+	Fetches the overlay of a locale, reading its files on first use.
+	"""
+	overlay = _overlays.get(locale)
+	if overlay is None:
+		with _lock:
+			overlay = _overlays.get(locale)
+			if overlay is None:
+				sources = _getSources(locale)
+				_stamps[locale] = _stampSources(sources)
+				overlay = _overlays[locale] = _readOverlay(sources)
+				if overlay:
+					log.debug(f"Loaded {len(overlay)} user character descriptions for {locale}")
+	return overlay
+
+
+def apply(locale: str, character: str, descriptions: Optional[Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+	"""
+	@param descriptions: NVDA's descriptions for the character, or None if there are none.
+	@return: the descriptions of the character with the user's ones applied, or None if there are none.
+	"""
+	entry = getOverlay(locale).get(character)
+	if entry is None:
+		return descriptions
+	replace, userDescriptions = entry
+	if replace or not descriptions:
+		return userDescriptions or None
+	return userDescriptions + descriptions
+
+
+def mergeItems(locale: str, items: Iterable[Tuple[str, Tuple[str, ...]]]) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+	"""
+	@param items: every character of a description index and its descriptions.
+	@return: every character and its descriptions with the user's ones applied, including characters only the user describes.
+	"""
+	overlay = getOverlay(locale)
+	described = set()
+	for character, descriptions in items:
+		if character not in overlay:
+			yield character, descriptions
+			continue
+		described.add(character)
+		descriptions = apply(locale, character, descriptions)
+		if descriptions:
+			yield character, descriptions
+	for character, (_replace, descriptions) in overlay.items():
+		if character not in described and descriptions:
+			yield character, descriptions
+
+
+def reload() -> Dict[str, Set[str]]:
+	"""
+	Rereads the overlays whose files were created, changed or removed since they were read.
+	Unchanged overlays are not read, and only the changed entries of the others are reported,
+	so that callers discard only what depends on them.
+	@return: the characters whose user descriptions changed, keyed by locale.
+	"""
+	changes: Dict[str, Set[str]] = {}
+	with _lock:
+		for locale, overlay in list(_overlays.items()):
+			sources = _getSources(locale)
+			stamps = _stampSources(sources)
+			if stamps == _stamps.get(locale):
+				continue
+			newOverlay = _readOverlay(sources)
+			changed = {
+				character for character in overlay.keys() | newOverlay.keys()
+				if overlay.get(character) != newOverlay.get(character)
+			}
+			#Lookups on other threads see either the old or the new overlay, never a partial one.
+			_overlays[locale] = newOverlay
+			_stamps[locale] = stamps
+			if changed:
+				changes[locale] = changed
+				log.debug(f"Reloaded user character descriptions for {locale}: {len(changed)} entries changed")
+	return changes
+
+
+def invalidate():
+	"""
+	Drops every loaded overlay, so that they are read again on next use.
+	"""
+	with _lock:
+		_overlays.clear()
+		_stamps.clear()
@@ -0,0 +1,206 @@
+# benchmark.py
+# Part of CJKEnhancedUI benchmarks
+# Measures the cost of the add-on's replacements of NVDA's hooks against the implementations they replace.
+# Usage: python benchmarks/benchmark.py [--repeat N] [--json results.json]
+# Set NVDA_APPDIR to an NVDA source directory to use NVDA's own character descriptions.
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import (
+	Callable,
+	Dict,
+	Iterable,
+	List,
+	NamedTuple,
+)
+
+import environment
+import corpora
+
+import braille  # noqa: E402
+import config  # noqa: E402
+import core  # noqa: E402
+import queueHandler  # noqa: E402
+import speech  # noqa: E402
+import ui  # noqa: E402
+from NVDAObjects.inputComposition import InputComposition  # noqa: E402
+
+LOCALE = "zh_TW"
+
+
+class Result(NamedTuple):
+	scenario: str
+	implementation: str
+	calls: int
+	meanMicroseconds: float
+	p50Microseconds: float
+	p99Microseconds: float
+	meanAllocatedBytes: float
+
+
+def percentile(sortedValues: List[float], fraction: float) -> float:
+	return sortedValues[int(fraction * (len(sortedValues) - 1))]
+
+
+def measure(
+		scenario: str,
+		implementation: str,
+		calls: Iterable[Callable[[], Callable[[], object]]],
+		repeat: int,
+) -> Result:
+	"""
+	Times each call, after an untimed warm up pass, then measures the memory each call allocates.
+	@param calls: functions preparing one call each, outside of the timed region, and returning it.
+	"""
+	calls = list(calls)
+	for prepare in calls:
+		prepare()()
+	timings = []
+	gc.disable()
+	try:
+		for _repetition in range(repeat):
+			for prepare in calls:
+				call = prepare()
+				start = time.perf_counter_ns()
+				call()
+				timings.append(time.perf_counter_ns() - start)
+	finally:
+		gc.enable()
+	allocated = []
+	tracemalloc.start()
+	try:
+		for prepare in calls:
+			call = prepare()
+			tracemalloc.reset_peak()
+			before = tracemalloc.get_traced_memory()[0]
+			call()
+			allocated.append(tracemalloc.get_traced_memory()[1] - before)
+	finally:
+		tracemalloc.stop()
+	timings.sort()
+	return Result(
+		scenario=scenario,
+		implementation=implementation,
+		calls=len(timings),
+		meanMicroseconds=statistics.fmean(timings) / 1000,
+		p50Microseconds=percentile(timings, 0.5) / 1000,
+		p99Microseconds=percentile(timings, 0.99) / 1000,
+		meanAllocatedBytes=statistics.fmean(allocated),
+	)
+
+
+def spellingCalls(getSpellingSpeech, texts: List[str]):
+	for text in texts:
+		def prepare(text=text):
+			return lambda: list(getSpellingSpeech(text, LOCALE))
+		yield prepare
+
+
+def pendingUpdateCalls(handlePendingUpdate, moves):
+	handler = braille.handler
+	region = braille.TextInfoRegion()
+	for text, position in moves:
+		def prepare(text=text, position=position):
+			core.runPendingCalls()
+			handler.messages.clear()
+			handler.buffer = handler.mainBuffer
+			region.nextText = text
+			region.nextCursorPos = position
+			handler._regionsPendingUpdate.add(region)
+			return lambda: handlePendingUpdate(handler)
+		yield prepare
+
+
+def reportNewTextCalls(reportNewText, updates):
+	composition = InputComposition()
+	for oldString, newString in updates:
+		def prepare(oldString=oldString, newString=newString):
+			queueHandler.pumpAll()
+			speech.speech.spoken.clear()
+			ui.messages.clear()
+			return lambda: reportNewText(composition, oldString, newString)
+		yield prepare
+
+
+def run(repeat: int) -> List[Result]:
+	environment.installDescriptions(LOCALE, corpora.allCharacters())
+	addon, plugin = environment.loadAddon()
+	config.conf["CJKEnhancedUI"]["speechReview"] = "On"
+	config.conf["CJKEnhancedUI"]["brailleReview"] = "Auto"
+	plugin.handleConfigChange()
+	implementations: Dict[str, Dict[str, Callable]] = {
+		"original": {
+			"getSpellingSpeech": plugin.default_getSpellingSpeech,
+			"handlePendingUpdate": plugin.default_handlePendingUpdate,
+			"reportNewText": plugin.default_reportNewText,
+		},
+		"patched": {
+			"getSpellingSpeech": addon.custom_getSpellingSpeech,
+			"handlePendingUpdate": addon.customer_handlePendingUpdate,
+			"reportNewText": addon.custom_reportNewText,
+		},
+	}
+	results = []
+	try:
+		for corpusName, text in corpora.CORPORA.items():
+			scenarios = {
+				f"getSpellingSpeech/{corpusName}/character": lambda impl: spellingCalls(
+					impl["getSpellingSpeech"], corpora.singleCharacters(text)
+				),
+				f"getSpellingSpeech/{corpusName}/line": lambda impl: spellingCalls(
+					impl["getSpellingSpeech"], corpora.lines(text)
+				),
+				f"handlePendingUpdate/{corpusName}": lambda impl: pendingUpdateCalls(
+					impl["handlePendingUpdate"], corpora.cursorMoves(text)
+				),
+				f"reportNewText/{corpusName}": lambda impl: reportNewTextCalls(
+					impl["reportNewText"], corpora.compositionUpdates(text)
+				),
+			}
+			for scenario, makeCalls in scenarios.items():
+				for implementationName, implementation in implementations.items():
+					results.append(measure(scenario, implementationName, makeCalls(implementation), repeat))
+	finally:
+		plugin.terminate()
+	return results
+
+
+def report(results: List[Result], out=sys.stdout):
+	header = f"{'scenario':<42} {'impl':<9} {'calls':>7} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'alloc B':>9}"
+	print(header, file=out)
+	print("-" * len(header), file=out)
+	byScenario: Dict[str, Dict[str, Result]] = {}
+	for result in results:
+		byScenario.setdefault(result.scenario, {})[result.implementation] = result
+		print(
+			f"{result.scenario:<42} {result.implementation:<9} {result.calls:>7}"
+			f" {result.meanMicroseconds:>9.2f} {result.p50Microseconds:>9.2f} {result.p99Microseconds:>9.2f}"
+			f" {result.meanAllocatedBytes:>9.0f}",
+			file=out,
+		)
+	print(file=out)
+	for scenario, pair in byScenario.items():
+		if "original" in pair and "patched" in pair:
+			ratio = pair["patched"].meanMicroseconds / pair["original"].meanMicroseconds
+			print(f"{scenario:<42} patched/original mean: {ratio:.2f}x", file=out)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--repeat", type=int, default=5, help="timed passes over each corpus")
+	parser.add_argument("--json", help="also write the results to this file, for comparison between versions")
+	args = parser.parse_args()
+	results = run(args.repeat)
+	report(results)
+	if args.json:
+		with open(args.json, "w", encoding="utf-8") as f:
+			json.dump([result._asdict() for result in results], f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,75 @@
+# corpora.py
+# Part of CJKEnhancedUI benchmarks
+# Sample texts used to drive the patched hooks.
+
+from typing import (
+	Dict,
+	Iterator,
+	List,
+	Tuple,
+)
+
+CJK_TEXT = (
+	"臺灣位於東亞，地處太平洋西岸，北鄰琉球群島，南接菲律賓群島。"
+	"島上山脈縱貫南北，中央山脈、雪山山脈與玉山山脈構成了島嶼的脊梁，"
+	"玉山主峰海拔三千九百五十二公尺，是東北亞的最高峰。"
+	"由於地形起伏劇烈，河川短促而湍急，雨季時常帶來豐沛的水量，"
+	"也孕育了多樣的生態系統與豐富的物種。"
+	"螢幕閱讀器讓視障者能夠透過語音與點字使用電腦，"
+	"在閱讀中文文件時，使用者經常需要逐字檢視，以分辨同音字與形近字。"
+)
+
+MIXED_TEXT = (
+	"請在 NVDA 的設定中開啟 Braille review 模式，然後按 numpad2 查看字詞說明。"
+	"This add-on works with NVDA 2023.1 或更新的版本，支援 zh_TW、zh_CN、ja 與 ko。"
+	"日本語のテキストでは、ひらがなとカタカナと漢字が混在します。"
+	"한국어 문장에는 한글과 漢字가 함께 쓰이기도 합니다。"
+)
+
+CORPORA: Dict[str, str] = {
+	"cjk": CJK_TEXT,
+	"mixed": MIXED_TEXT,
+}
+
+
+def allCharacters() -> str:
+	return "".join(CORPORA.values())
+
+
+def singleCharacters(text: str) -> List[str]:
+	"""
+	@return: every character of the text in order, as reviewed with numpad1 and numpad3.
+	"""
+	return [char for char in text if not char.isspace()]
+
+
+def lines(text: str, width: int = 40) -> List[str]:
+	"""
+	@return: the text cut into lines of at most width characters, as spelled with the review line commands.
+	"""
+	return [text[start:start + width] for start in range(0, len(text), width)]
+
+
+def cursorMoves(text: str, width: int = 40) -> Iterator[Tuple[str, int]]:
+	"""
+	Simulates moving the caret through the text, line by line.
+	@return: the line text and caret position within it for each move.
+	"""
+	for line in lines(text, width):
+		for position in range(len(line)):
+			yield line, position
+
+
+def compositionUpdates(text: str) -> Iterator[Tuple[str, str]]:
+	"""
+	Simulates an IME composing the text a phrase at a time, one character per update.
+	@return: the old and new composition strings of each update.
+	"""
+	composition = ""
+	for char in text:
+		if char.isspace() or len(composition) >= 8:
+			composition = ""
+			continue
+		newComposition = composition + char
+		yield composition, newComposition
+		composition = newComposition
@@ -0,0 +1,75 @@
+# environment.py
+# Part of CJKEnhancedUI benchmarks
+# Loads the add-on on plain CPython, on top of the stand-in NVDA modules in the stubs directory.
+
+import os
+import sys
+from typing import (
+	Dict,
+	Iterable,
+	List,
+)
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+STUBS_DIR = os.path.join(BENCHMARKS_DIR, "stubs")
+ADDON_DIR = os.path.join(ROOT_DIR, "addon")
+
+for path in (ADDON_DIR, STUBS_DIR):
+	if path not in sys.path:
+		sys.path.insert(0, path)
+
+import characterProcessing  # noqa: E402
+import globalVars  # noqa: E402
+
+
+def hasNVDADescriptions(locale: str) -> bool:
+	"""
+	@return: whether NVDA_APPDIR points at an NVDA source or install directory with descriptions for the locale.
+	"""
+	fileName = os.path.join(globalVars.appDir, "locale", locale, "characterDescriptions.dic")
+	return os.path.isfile(fileName)
+
+
+def syntheticDescriptions(characters: Iterable[str]) -> Dict[str, List[str]]:
+	"""
+	Builds descriptions shaped like those of the CJK locales, two to four per character,
+	for use when NVDA's own dictionaries are not available.
+	"""
+	entries = {}
+	for character in characters:
+		if ord(character) < 0x2E80 or character in entries:
+			continue
+		count = 2 + ord(character) % 3
+		entries[character] = [f"{character}字的{character}", f"木字旁的{character}", f"{character}{character}相連"][:count]
+		if count == 4:
+			entries[character].append(f"部首{character}")
+	return entries
+
+
+def installDescriptions(locale: str, characters: Iterable[str]):
+	"""
+	Makes descriptions available for the locale, from NVDA when possible and synthetic otherwise.
+	"""
+	if not hasNVDADescriptions(locale):
+		characterProcessing.setCharacterDescriptions(locale, syntheticDescriptions(characters))
+	if not hasNVDADescriptions("en"):
+		characterProcessing.setCharacterDescriptions("en", {
+			chr(c): [word] for c, word in zip(range(ord("a"), ord("z") + 1), NATO_ALPHABET)
+		})
+
+
+NATO_ALPHABET = (
+	"alfa bravo charlie delta echo foxtrot golf hotel india juliett kilo lima mike november"
+	" oscar papa quebec romeo sierra tango uniform victor whiskey xray yankee zulu"
+).split()
+
+
+def loadAddon():
+	"""
+	Imports the add-on and creates its global plugin, which installs its patches.
+	@return: the add-on module and the plugin instance.
+	"""
+	from globalPlugins import cjkEnhancedUI
+	plugin = cjkEnhancedUI.GlobalPlugin()
+	return cjkEnhancedUI, plugin
@@ -0,0 +1,90 @@
+# memory.py
+# Part of CJKEnhancedUI benchmarks
+# Reports the memory held per entry by the dictionary description store and by the interned one.
+# Usage: python benchmarks/memory.py [--locales zh_TW zh_CN ja ko]
+# Set NVDA_APPDIR to an NVDA source directory to measure NVDA's own dictionaries; synthetic descriptions,
+# which repeat far more than real ones, are used otherwise.
+
+import argparse
+from array import array
+import os
+import sys
+from typing import (
+	Dict,
+	List,
+	Tuple,
+)
+
+import environment
+import globalVars
+
+from globalPlugins.cjkEnhancedUI import compiledDictionary, descriptionIndex  # noqa: E402
+from globalPlugins.cjkEnhancedUI.internedDescriptions import InternedDescriptions  # noqa: E402
+
+#: The characters described synthetically for each locale when NVDA's dictionaries are not available.
+SYNTHETIC_RANGES = {
+	"ko": range(0xAC00, 0xD7A4),
+}
+DEFAULT_SYNTHETIC_RANGE = range(0x4E00, 0xA000)
+
+
+def deepSize(obj, seen=None) -> int:
+	"""
+	@return: the bytes held by an object and every object it refers to, counting shared objects once.
+	"""
+	if seen is None:
+		seen = set()
+	if id(obj) in seen:
+		return 0
+	seen.add(id(obj))
+	size = sys.getsizeof(obj)
+	if isinstance(obj, (str, bytes, array, int)):
+		return size
+	if isinstance(obj, dict):
+		size += sum(deepSize(key, seen) + deepSize(value, seen) for key, value in obj.items())
+	elif isinstance(obj, (tuple, list, set)):
+		size += sum(deepSize(item, seen) for item in obj)
+	if hasattr(obj, "__dict__"):
+		size += deepSize(vars(obj), seen)
+	return size
+
+
+def loadEntries(locale: str) -> Tuple[Dict[str, List[str]], str]:
+	"""
+	@return: the merged entries of the locale's fallback chain, and where they come from.
+	"""
+	entries: Dict[str, List[str]] = {}
+	for candidate in reversed(descriptionIndex.getLocaleChain(locale)):
+		path = os.path.join(globalVars.appDir, "locale", candidate, "characterDescriptions.dic")
+		if os.path.isfile(path):
+			entries.update(compiledDictionary.parseDictionary(path))
+	if entries:
+		return entries, "NVDA"
+	characters = map(chr, SYNTHETIC_RANGES.get(locale, DEFAULT_SYNTHETIC_RANGE))
+	return environment.syntheticDescriptions(characters), "synthetic"
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--locales", nargs="+", default=["zh_TW", "zh_CN", "ja", "ko"])
+	args = parser.parse_args()
+	header = f"{'locale':<8} {'source':<10} {'entries':>8} {'distinct':>9} {'dict B/entry':>13} {'interned B/entry':>17} {'saved':>7}"
+	print(header)
+	print("-" * len(header))
+	for locale in args.locales:
+		entries, source = loadEntries(locale)
+		#The layout of descriptionIndex.DescriptionIndex: a dictionary of tuples of strings.
+		dictionaryStore = {character: tuple(descriptions) for character, descriptions in entries.items()}
+		internedStore = InternedDescriptions(entries.items(), locale)
+		dictionaryBytes = deepSize(dictionaryStore)
+		internedBytes = deepSize(internedStore)
+		count = len(entries)
+		distinct = len({description for descriptions in entries.values() for description in descriptions})
+		print(
+			f"{locale:<8} {source:<10} {count:>8} {distinct:>9} {dictionaryBytes / count:>13.1f}"
+			f" {internedBytes / count:>17.1f} {1 - internedBytes / dictionaryBytes:>7.1%}"
+		)
+
+
+if __name__ == "__main__":
+	main()
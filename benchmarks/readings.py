@@ -0,0 +1,68 @@
+# readings.py
+# Part of CJKEnhancedUI benchmarks
+# Reports the load time and memory of each reading shard, and which shards reviewing a text loads.
+# Usage: python benchmarks/readings.py [--system zhuyin] [--text TEXT]
+# Shards built by tools/buildReadings.py are measured when present; synthetic shards covering every
+# code point of each block, which overstate the extension blocks, are measured otherwise.
+
+import argparse
+import os
+import tempfile
+import time
+
+import environment  # noqa: F401
+
+from globalPlugins.cjkEnhancedUI import readingIndex  # noqa: E402
+
+#: Syllables the synthetic readings are made of.
+SYNTHETIC_SYLLABLES = ("ㄓㄨㄥ", "ㄨㄣˊ", "ㄗˋ", "ㄘㄜˋ", "ㄕˋ", "ㄧ", "ㄦˋ", "ㄙㄢ", "ㄌㄧㄡˋ", "ㄑㄧ")
+
+#: A text of common characters only, as most reviewed text is.
+DEFAULT_TEXT = "中文字的讀音在檢視時逐字朗讀"
+
+
+def writeSyntheticShards(directory: str, system: str):
+	os.makedirs(os.path.join(directory, system))
+	for block in readingIndex.BLOCKS:
+		with open(os.path.join(directory, system, f"{block.name}.tsv"), "w", encoding="utf-8") as f:
+			for codePoint in range(block.first, block.last + 1):
+				first = SYNTHETIC_SYLLABLES[codePoint % len(SYNTHETIC_SYLLABLES)]
+				second = SYNTHETIC_SYLLABLES[codePoint // 7 % len(SYNTHETIC_SYLLABLES)]
+				f.write(f"{codePoint:04X}\t{first} {second}\n" if codePoint % 3 else f"{codePoint:04X}\t{first}\n")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--system", default="zhuyin", choices=sorted(set(readingIndex.READING_SYSTEMS.values())))
+	parser.add_argument("--text", default=DEFAULT_TEXT, help="text whose review is measured")
+	args = parser.parse_args()
+	locale = next(locale for locale, system in readingIndex.READING_SYSTEMS.items() if system == args.system)
+	source = "built"
+	if not os.path.isdir(os.path.join(readingIndex.READINGS_DIRECTORY, args.system)):
+		temporaryDirectory = tempfile.TemporaryDirectory()
+		readingIndex.READINGS_DIRECTORY = temporaryDirectory.name
+		writeSyntheticShards(temporaryDirectory.name, args.system)
+		source = "synthetic"
+	print(f"Reviewing {len(args.text)} characters with {source} shards:")
+	start = time.perf_counter()
+	for character in args.text:
+		readingIndex.getReading(locale, character)
+	print(f"  {(time.perf_counter() - start) * 1000:.1f} ms, shards loaded: {readingIndex.stats()}\n")
+	header = f"{'shard':<16} {'readings':>9} {'distinct':>9} {'file KiB':>9} {'load ms':>8} {'KiB':>8} {'B/reading':>10}"
+	print(header)
+	print("-" * len(header))
+	for block in readingIndex.BLOCKS:
+		path = readingIndex.getShardFile(args.system, block)
+		if not os.path.isfile(path):
+			continue
+		readingIndex.invalidate()
+		shard = readingIndex.getShard(args.system, block)
+		stats = readingIndex.shardStats[(args.system, block.name)]
+		print(
+			f"{block.name:<16} {stats.count:>9} {shard.distinctReadings:>9} {os.path.getsize(path) / 1024:>9.0f}"
+			f" {stats.loadTime:>8.1f} {stats.size / 1024:>8.0f} {stats.size / max(stats.count, 1):>10.1f}"
+		)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,210 @@
+# replay.py
+# Part of CJKEnhancedUI benchmarks
+# Drives a trace recorded by the add-on's trace recorder through its hooks and review scripts,
+# and reports throughput and tail latency per kind of event.
+# Usage: python benchmarks/replay.py trace.jsonl [--repeat N]
+# Set NVDA_APPDIR to an NVDA source directory to use NVDA's own character descriptions.
+
+import argparse
+import gc
+import json
+import time
+from typing import (
+	Any,
+	Dict,
+	List,
+	Optional,
+)
+
+import environment
+
+import api  # noqa: E402
+import braille  # noqa: E402
+import config  # noqa: E402
+import core  # noqa: E402
+import languageHandler  # noqa: E402
+import queueHandler  # noqa: E402
+import speech  # noqa: E402
+import textInfos.offsets  # noqa: E402
+import ui  # noqa: E402
+from NVDAObjects.inputComposition import InputComposition  # noqa: E402
+
+#: The settings of a trace header which are add-on configuration values.
+ADDON_SETTINGS = ("speechReview", "brailleReview", "spellingChunkSize", "brailleReviewDelay", "phraseReview")
+
+
+class LineTextInfo:
+	"""
+	An offset based text info over a single line, standing in for the review position.
+	"""
+	#: Offsets count characters rather than UTF-16 code units.
+	encoding = None
+
+	def __init__(self, line: str, start: int, end: int, obj=None):
+		self.line = line
+		self._startOffset = start
+		self._endOffset = end
+		self.obj = obj
+
+	@property
+	def text(self) -> str:
+		return self.line[self._startOffset:self._endOffset]
+
+	@property
+	def bookmark(self) -> textInfos.offsets.Offsets:
+		return textInfos.offsets.Offsets(self._startOffset, self._endOffset)
+
+	def copy(self) -> "LineTextInfo":
+		return LineTextInfo(self.line, self._startOffset, self._endOffset, self.obj)
+
+	def expand(self, unit):
+		if unit == "line":
+			self._startOffset, self._endOffset = 0, len(self.line)
+		else:
+			self._endOffset = min(self._startOffset + 1, len(self.line))
+
+	def collapse(self):
+		self._endOffset = self._startOffset
+
+	def move(self, unit, direction: int) -> int:
+		offset = self._startOffset + direction
+		if not 0 <= offset < len(self.line):
+			return 0
+		self._startOffset = self._endOffset = offset
+		return direction
+
+	def compareEndPoints(self, other: "LineTextInfo", which: str) -> int:
+		if which == "startToStart":
+			return self._startOffset - other._startOffset
+		return self._startOffset - other._endOffset
+
+
+def loadTrace(path: str):
+	with open(path, encoding="utf-8") as f:
+		lines = [json.loads(line) for line in f if line.strip()]
+	if not lines or lines[0].get("e") != "header":
+		raise ValueError(f"{path} is not a CJKEnhancedUI trace")
+	return lines[0], lines[1:]
+
+
+def getTraceCharacters(events: List[Dict[str, Any]]) -> str:
+	return "".join({
+		character
+		for event in events
+		for field in ("text", "old", "new", "line")
+		for character in (event.get(field) or "")
+	})
+
+
+def getReviewPosition(event: Dict[str, Any]) -> LineTextInfo:
+	"""
+	Places the review position so that the recorded script ends up on the recorded character.
+	"""
+	text = event["text"]
+	line = event.get("line")
+	offset = event.get("offset")
+	if line is None or offset is None:
+		return LineTextInfo(text, 0, len(text))
+	if event["name"] == "review_nextCharacter" and offset > 0:
+		offset -= 1
+	elif event["name"] == "review_previousCharacter" and offset < len(line) - 1:
+		offset += 1
+	return LineTextInfo(line, offset, offset + 1)
+
+
+class Replayer:
+
+	def __init__(self, plugin):
+		self.plugin = plugin
+		self.region = braille.TextInfoRegion()
+		self.composition = InputComposition()
+
+	def replay(self, event: Dict[str, Any]):
+		kind = event["e"]
+		if kind == "update":
+			handler = braille.handler
+			handler.buffer = handler.mainBuffer
+			self.region.nextText = event["text"]
+			self.region.nextCursorPos = event["pos"]
+			handler._regionsPendingUpdate.add(self.region)
+			braille.BrailleHandler._handlePendingUpdate(handler)
+		elif kind == "composition":
+			InputComposition.reportNewText(self.composition, event["old"], event["new"])
+		elif kind == "spelling":
+			list(speech.speech.getSpellingSpeech(event["text"], event["locale"], event["desc"]))
+		elif kind == "script":
+			api.setReviewPosition(getReviewPosition(event))
+			getattr(self.plugin, "script_" + event["name"])(None)
+		else:
+			raise ValueError(f"Unknown event kind {kind}")
+
+
+def runDeferredWork(gapMilliseconds: Optional[float], delay: int):
+	"""
+	Runs what NVDA would run between two events: queued functions always,
+	and delayed calls only when the user paused long enough for them to fire.
+	"""
+	queueHandler.pumpAll()
+	if gapMilliseconds is None or gapMilliseconds >= delay:
+		core.runPendingCalls()
+	speech.speech.spoken.clear()
+	braille.handler.messages.clear()
+	ui.messages.clear()
+
+
+def percentile(sortedValues: List[float], fraction: float) -> float:
+	return sortedValues[int(fraction * (len(sortedValues) - 1))]
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("trace")
+	parser.add_argument("--repeat", type=int, default=1, help="passes over the trace")
+	args = parser.parse_args()
+	header, events = loadTrace(args.trace)
+	#Replaying the script which caused a nested event causes it again.
+	events = [event for event in events if not event.get("nested")]
+	languageHandler.setLanguage(header["locale"])
+	environment.installDescriptions(header["locale"], getTraceCharacters(events))
+	_addon, plugin = environment.loadAddon()
+	for name in ADDON_SETTINGS:
+		if name in header:
+			config.conf["CJKEnhancedUI"][name] = header[name]
+	plugin.handleConfigChange()
+	replayer = Replayer(plugin)
+	delay = header.get("brailleReviewDelay", 0)
+	timings: Dict[str, List[float]] = {}
+	gc.disable()
+	try:
+		for _repetition in range(args.repeat):
+			for index, event in enumerate(events):
+				start = time.perf_counter_ns()
+				replayer.replay(event)
+				elapsed = time.perf_counter_ns() - start
+				timings.setdefault(event["e"], []).append(elapsed / 1000)
+				nextEvent = events[index + 1] if index + 1 < len(events) else None
+				gap = nextEvent["t"] - event["t"] if nextEvent else None
+				start = time.perf_counter_ns()
+				runDeferredWork(gap, delay)
+				timings.setdefault("deferred", []).append((time.perf_counter_ns() - start) / 1000)
+	finally:
+		gc.enable()
+		plugin.terminate()
+	columns = f"{'event':<12} {'count':>8} {'events/s':>10} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'p99.9 µs':>9} {'max µs':>9}"
+	print(columns)
+	print("-" * len(columns))
+	for kind, values in sorted(timings.items()):
+		values.sort()
+		total = sum(values)
+		print(
+			f"{kind:<12} {len(values):>8} {len(values) / total * 1e6 if total else 0:>10.0f}"
+			f" {total / len(values):>9.2f} {percentile(values, 0.5):>9.2f} {percentile(values, 0.99):>9.2f}"
+			f" {percentile(values, 0.999):>9.2f} {values[-1]:>9.2f}"
+		)
+	eventCount = len(events) * args.repeat
+	totalSeconds = sum(sum(values) for values in timings.values()) / 1e6
+	print(f"\n{eventCount} events replayed in {totalSeconds * 1000:.1f} ms, {eventCount / totalSeconds:.0f} events/s")
+
+
+if __name__ == "__main__":
+	main()
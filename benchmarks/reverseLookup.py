@@ -0,0 +1,87 @@
+# reverseLookup.py
+# Part of CJKEnhancedUI benchmarks
+# Measures building and searching the reverse description index against a linear scan of every description.
+# Usage: python benchmarks/reverseLookup.py [--queries N] [--locale zh_TW]
+# Set NVDA_APPDIR to an NVDA source directory to search NVDA's full dictionary for the locale.
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from typing import (
+	List,
+	Tuple,
+)
+
+import environment
+
+from globalPlugins.cjkEnhancedUI import descriptionIndex, reverseIndex  # noqa: E402
+
+#: The CJK Unified Ideographs block, described synthetically when NVDA's dictionary is not available.
+SYNTHETIC_CHARACTERS = "".join(map(chr, range(0x4E00, 0xA000)))
+
+
+def linearSearch(entries: List[Tuple[str, Tuple[str, ...]]], query: str) -> List[str]:
+	return [character for character, descriptions in entries if any(query in description for description in descriptions)]
+
+
+def sampleQueries(entries: List[Tuple[str, Tuple[str, ...]]], count: int) -> List[str]:
+	"""
+	Picks substrings of one to three characters from random descriptions, so that every query has matches.
+	"""
+	generator = random.Random(0)
+	queries = []
+	while len(queries) < count:
+		_character, descriptions = generator.choice(entries)
+		description = generator.choice(descriptions)
+		length = min(len(description), generator.randint(1, 3))
+		start = generator.randint(0, len(description) - length)
+		queries.append(description[start:start + length])
+	return queries
+
+
+def timeQueries(search, queries: List[str]) -> List[float]:
+	timings = []
+	for query in queries:
+		start = time.perf_counter_ns()
+		search(query)
+		timings.append((time.perf_counter_ns() - start) / 1000)
+	timings.sort()
+	return timings
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--locale", default="zh_TW")
+	parser.add_argument("--queries", type=int, default=500, help="number of random queries")
+	args = parser.parse_args()
+	environment.installDescriptions(args.locale, SYNTHETIC_CHARACTERS)
+	entries = list(descriptionIndex.getIndex(args.locale).items())
+	tracemalloc.start()
+	start = time.perf_counter()
+	index = reverseIndex.ReverseIndex(entries)
+	buildSeconds = time.perf_counter() - start
+	indexBytes = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	print(f"{len(index)} entries indexed in {buildSeconds * 1000:.1f} ms, {indexBytes / 1024 / 1024:.1f} MiB")
+	queries = sampleQueries(entries, args.queries)
+	for query in queries:
+		expected = set(linearSearch(entries, query))
+		found = {match.character for match in index.search(query, limit=len(entries))}
+		if found != expected:
+			raise AssertionError(f"Reverse index results differ from a linear scan for {query!r}")
+	print(f"{'search':<10} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10} {'max µs':>10}")
+	for name, search in (
+		("index", lambda query: index.search(query)),
+		("linear", lambda query: linearSearch(entries, query)),
+	):
+		timings = timeQueries(search, queries)
+		print(
+			f"{name:<10} {statistics.fmean(timings):>10.1f} {timings[len(timings) // 2]:>10.1f}"
+			f" {timings[int(0.99 * (len(timings) - 1))]:>10.1f} {timings[-1]:>10.1f}"
+		)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,5 @@
+"""Stand-in for NVDA's NVDAObjects package."""
+
+
+class NVDAObject:
+	pass
@@ -0,0 +1,30 @@
+"""Stand-in for NVDA's NVDAObjects.inputComposition module."""
+import queueHandler
+import speech
+from . import NVDAObject
+
+
+def calculateInsertedChars(oldComp, newComp):
+	oldLen = len(oldComp)
+	newLen = len(newComp)
+	minLen = min(oldLen, newLen)
+	diffStart = 0
+	diffEnd = newLen
+	for index in range(minLen):
+		if newComp[index] != oldComp[index]:
+			break
+		diffStart = index + 1
+	for index in range(minLen, 0, -1):
+		backIndex = index - minLen - 1
+		if newComp[backIndex] != oldComp[backIndex]:
+			break
+		diffEnd = newLen + backIndex
+	diffEnd = max(diffEnd, diffStart + (newLen - oldLen))
+	return newComp[diffStart:diffEnd]
+
+
+class InputComposition(NVDAObject):
+	def reportNewText(self, oldString, newString):
+		newText = calculateInsertedChars(oldString.strip("　"), newString.strip("　"))
+		if newText:
+			queueHandler.queueFunction(queueHandler.eventQueue, speech.speakText, newText)
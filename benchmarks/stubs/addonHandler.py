@@ -0,0 +1,19 @@
+"""Stand-in for NVDA's addonHandler module."""
+import builtins
+
+
+def initTranslation():
+	builtins._ = lambda message: message
+	builtins.ngettext = lambda singular, plural, n: singular if n == 1 else plural
+	builtins.pgettext = lambda context, message: message
+
+
+class _Addon:
+	manifest = {"summary": "CJK Enhanced UI", "name": "cjkEnhancedUI"}
+
+
+def getCodeAddon():
+	return _Addon()
+
+
+initTranslation()
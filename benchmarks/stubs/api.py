@@ -0,0 +1,12 @@
+"""Stand-in for NVDA's api module."""
+_reviewPosition = None
+
+
+def getReviewPosition():
+	return _reviewPosition
+
+
+def setReviewPosition(info, *args, **kwargs):
+	global _reviewPosition
+	_reviewPosition = info
+	return True
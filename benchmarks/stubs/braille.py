@@ -0,0 +1,126 @@
+"""Stand-in for NVDA's braille module.
+Translation is a cheap per-character mapping; messages shown on the display are collected in L{BrailleHandler.messages}.
+"""
+import config
+import extensionPoints
+import keyboardHandler
+
+displayChanged = extensionPoints.Action()
+
+
+class Region:
+	def __init__(self):
+		self.rawText = ""
+		self.cursorPos = None
+		self.selectionStart = self.selectionEnd = None
+		self.brailleCells = []
+		self.brailleCursorPos = None
+		self.brailleSelectionStart = self.brailleSelectionEnd = None
+		self.brailleToRawPos = []
+		self.rawToBraillePos = []
+
+	def update(self):
+		self.brailleCells = [ord(char) & 0xff for char in self.rawText]
+		self.brailleToRawPos = list(range(len(self.rawText)))
+		self.rawToBraillePos = list(range(len(self.rawText)))
+		if self.cursorPos is not None:
+			self.brailleCursorPos = self.cursorPos
+
+
+class TextRegion(Region):
+	def __init__(self, text):
+		super().__init__()
+		self.rawText = text
+
+
+class TextInfoRegion(Region):
+	def __init__(self, obj=None):
+		super().__init__()
+		self.obj = obj
+		self.pendingCaretUpdate = False
+		self.nextText = ""
+		self.nextCursorPos = None
+
+	def update(self):
+		self.rawText = self.nextText
+		self.cursorPos = self.nextCursorPos
+		super().update()
+
+
+class BrailleBuffer:
+	def __init__(self, handler):
+		self.handler = handler
+		self.regions = []
+
+	def clear(self):
+		self.regions = []
+
+	def saveWindow(self):
+		pass
+
+	def restoreWindow(self):
+		pass
+
+	def update(self):
+		pass
+
+
+class BrailleHandler:
+	def __init__(self):
+		self.enabled = True
+		self.displaySize = 40
+		self.display = type("Display", (), {"name": "stub", "numCells": 40})()
+		self.mainBuffer = BrailleBuffer(self)
+		self.messageBuffer = BrailleBuffer(self)
+		self.buffer = self.mainBuffer
+		self._regionsPendingUpdate = set()
+		self._keyCountForLastMessage = 0
+		self.messages = []
+
+	def _handlePendingUpdate(self):
+		if not self._regionsPendingUpdate:
+			return
+		try:
+			self.mainBuffer.saveWindow()
+			for region in self._regionsPendingUpdate:
+				region.update()
+			self.mainBuffer.update()
+			self.mainBuffer.restoreWindow()
+			if self.buffer is self.mainBuffer:
+				self.update()
+		finally:
+			self._regionsPendingUpdate.clear()
+
+	def message(self, text):
+		if not self.enabled or config.conf["braille"]["showMessages"] == 0 or text is None:
+			return
+		if self.buffer is self.messageBuffer:
+			self.buffer.clear()
+		else:
+			self.buffer = self.messageBuffer
+		region = TextRegion(text)
+		region.update()
+		self.buffer.regions.append(region)
+		self.buffer.update()
+		self.update()
+		self._resetMessageTimer()
+		self._keyCountForLastMessage = keyboardHandler.keyCounter
+
+	def _resetMessageTimer(self):
+		#Records the messages shown, for the benchmarks to inspect.
+		self.messages.append("".join(region.rawText for region in self.messageBuffer.regions))
+
+	def scrollToCursorOrSelection(self, region):
+		pass
+
+	def update(self):
+		pass
+
+	def _dismissMessage(self):
+		self.buffer = self.mainBuffer
+
+	def handleReviewMove(self, shouldAutoTether=False):
+		pass
+
+
+handler = BrailleHandler()
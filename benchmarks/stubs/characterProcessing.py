@@ -0,0 +1,97 @@
+"""Stand-in for NVDA's characterProcessing module.
+Description data is registered with L{setCharacterDescriptions} instead of being read from NVDA's locale directory,
+unless NVDA_APPDIR points at an NVDA source tree, in which case the real characterDescriptions.dic files are parsed.
+"""
+import codecs
+import enum
+import os
+
+import globalVars
+
+
+class SymbolLevel(enum.IntEnum):
+	NONE = 0
+	SOME = 100
+	MOST = 200
+	ALL = 300
+	CHAR = 1000
+
+
+_registered = {}
+
+
+def setCharacterDescriptions(locale, entries):
+	_registered[locale] = {key: list(value) for key, value in entries.items()}
+	_charDescLocaleDataMap.invalidateLocaleData(locale)
+
+
+class CharacterDescriptions:
+	def __init__(self, locale):
+		self._entries = {}
+		if locale in _registered:
+			self._entries = {key: list(value) for key, value in _registered[locale].items()}
+			return
+		fileName = os.path.join(globalVars.appDir, "locale", locale, "characterDescriptions.dic")
+		if not os.path.isfile(fileName):
+			raise LookupError(fileName)
+		with codecs.open(fileName, "r", "utf_8_sig", errors="replace") as f:
+			for line in f:
+				if line.isspace() or line.startswith("#"):
+					continue
+				line = line.rstrip("\r\n")
+				temp = line.split("\t")
+				if len(temp) > 1:
+					key = temp.pop(0)
+					self._entries[key] = temp
+
+	def getCharacterDescription(self, character):
+		return self._entries.get(character)
+
+
+class LocaleDataMap:
+	def __init__(self, localeDataFactory):
+		self._localeDataFactory = localeDataFactory
+		self._dataMap = {}
+
+	def fetchLocaleData(self, locale, fallback=True):
+		data = self._dataMap.get(locale)
+		if data is not None:
+			return data
+		try:
+			data = self._localeDataFactory(locale)
+		except LookupError:
+			if not fallback or "_" not in locale:
+				raise
+			return self.fetchLocaleData(locale.split("_")[0], fallback=False)
+		self._dataMap[locale] = data
+		return data
+
+	def invalidateLocaleData(self, locale):
+		self._dataMap.pop(locale, None)
+
+	def invalidateAllData(self):
+		self._dataMap.clear()
+
+
+_charDescLocaleDataMap = LocaleDataMap(CharacterDescriptions)
+
+
+def getCharacterDescription(locale, character):
+	try:
+		data = _charDescLocaleDataMap.fetchLocaleData(locale)
+	except LookupError:
+		if not locale.startswith("en"):
+			return getCharacterDescription("en", character)
+		raise LookupError("en")
+	desc = data.getCharacterDescription(character)
+	if not desc and not locale.startswith("en"):
+		desc = getCharacterDescription("en", character)
+	return desc
+
+
+def processSpeechSymbol(locale, symbol):
+	return symbol
+
+
+def processSpeechSymbols(locale, text, level):
+	return text
@@ -0,0 +1,71 @@
+"""Stand-in for NVDA's config module.
+config.conf is a plain nested dictionary; defaults for spec entries are applied by L{applySpec}.
+"""
+import re
+
+import extensionPoints
+
+post_configProfileSwitch = extensionPoints.Action()
+post_configSave = extensionPoints.Action()
+post_configReset = extensionPoints.Action()
+pre_configSave = extensionPoints.Action()
+
+
+class _Spec(dict):
+	def __setitem__(self, key, value):
+		super().__setitem__(key, value)
+		section = conf.setdefault(key, {})
+		for name, spec in value.items():
+			if name not in section:
+				section[name] = _default(spec)
+
+
+_defaultPattern = re.compile(r"default=(?:\"([^\"]*)\"|'([^']*)'|([^,)]*))")
+
+
+def _default(spec):
+	match = _defaultPattern.search(spec)
+	if not match:
+		return None
+	value = next(group for group in match.groups() if group is not None)
+	kind = spec.split("(", 1)[0]
+	if kind == "boolean":
+		return value == "True"
+	if kind == "integer":
+		return int(value)
+	if kind == "float":
+		return float(value)
+	return value
+
+
+class _Conf(dict):
+	spec = None
+
+	def save(self):
+		pre_configSave.notify()
+		post_configSave.notify()
+
+
+conf = _Conf({
+	"speech": {
+		"autoLanguageSwitching": True,
+		"autoDialectSwitching": False,
+		"symbolLevel": 100,
+		"stub": {
+			"capPitchChange": 30,
+			"sayCapForCapitals": False,
+			"beepForCapitals": False,
+			"useSpellingFunctionality": True,
+		},
+	},
+	"keyboard": {
+		"speakTypedCharacters": True,
+		"speakTypedWords": False,
+	},
+	"braille": {
+		"translationTable": "zh-tw.ctb",
+		"messageTimeout": 4,
+		"showMessages": 1,
+	},
+})
+conf.spec = _Spec()
@@ -0,0 +1,8 @@
+"""Stand-in for NVDA's controlTypes module."""
+import enum
+
+
+class OutputReason(enum.Enum):
+	CARET = "caret"
+	FOCUS = "focus"
+	MESSAGE = "message"
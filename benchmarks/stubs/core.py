@@ -0,0 +1,50 @@
+"""Stand-in for NVDA's core module.
+Delayed calls are collected and run by L{runPendingCalls} instead of a wx timer.
+"""
+import time
+
+_pending = []
+
+
+class _CallLater:
+	def __init__(self, delay, callable, args, kwargs):
+		self.due = time.monotonic() + delay / 1000
+		self.callable = callable
+		self.args = args
+		self.kwargs = kwargs
+		self.running = True
+
+	def IsRunning(self):
+		return self.running
+
+	def Stop(self):
+		self.running = False
+		if self in _pending:
+			_pending.remove(self)
+
+	def Start(self, delay=None, *args, **kwargs):
+		if delay is not None:
+			self.due = time.monotonic() + delay / 1000
+		self.running = True
+		if self not in _pending:
+			_pending.append(self)
+
+	def Restart(self, delay=None, *args, **kwargs):
+		self.Start(delay)
+
+
+def callLater(delay, callable, *args, **kwargs):
+	call = _CallLater(delay, callable, args, kwargs)
+	_pending.append(call)
+	return call
+
+
+def runPendingCalls(force=True):
+	now = time.monotonic()
+	for call in list(_pending):
+		if not call.running:
+			_pending.remove(call)
+		elif force or call.due <= now:
+			_pending.remove(call)
+			call.running = False
+			call.callable(*call.args, **call.kwargs)
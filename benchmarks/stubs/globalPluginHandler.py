@@ -0,0 +1,9 @@
+"""Stand-in for NVDA's globalPluginHandler module."""
+
+
+class GlobalPlugin:
+	def __init__(self):
+		pass
+
+	def terminate(self):
+		pass
@@ -0,0 +1,12 @@
+"""Stand-in for NVDA's globalVars module."""
+import os
+import tempfile
+
+
+class _AppArgs:
+	configPath = os.path.join(tempfile.gettempdir(), "nvdaStubConfig")
+	secure = False
+
+
+appArgs = _AppArgs()
+appDir = os.environ.get("NVDA_APPDIR", os.path.dirname(os.path.abspath(__file__)))
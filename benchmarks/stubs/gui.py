@@ -0,0 +1,13 @@
+"""Stand-in for NVDA's gui module."""
+
+
+class _Context:
+	class WINDOWS_LOCKED:
+		translatedMessage = "Action unavailable while Windows is locked"
+
+
+class blockAction:
+	Context = _Context
+
+
+mainFrame = None
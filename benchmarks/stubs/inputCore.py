@@ -0,0 +1,5 @@
+"""Stand-in for NVDA's inputCore module."""
+
+
+class InputGesture:
+	pass
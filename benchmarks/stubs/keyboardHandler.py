@@ -0,0 +1,2 @@
+"""Stand-in for NVDA's keyboardHandler module."""
+keyCounter = 0
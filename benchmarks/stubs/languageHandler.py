@@ -0,0 +1,11 @@
+"""Stand-in for NVDA's languageHandler module."""
+_language = "zh_TW"
+
+
+def getLanguage():
+	return _language
+
+
+def setLanguage(language):
+	global _language
+	_language = language
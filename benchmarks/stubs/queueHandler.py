@@ -0,0 +1,16 @@
+"""Stand-in for NVDA's queueHandler module.
+Queued functions are kept until L{pumpAll} runs them, like NVDA's core pump.
+"""
+import collections
+
+eventQueue = collections.deque()
+
+
+def queueFunction(queue, func, *args, **kwargs):
+	queue.append((func, args, kwargs))
+
+
+def pumpAll():
+	while eventQueue:
+		func, args, kwargs = eventQueue.popleft()
+		func(*args, **kwargs)
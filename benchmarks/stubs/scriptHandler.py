@@ -0,0 +1,15 @@
+"""Stand-in for NVDA's scriptHandler module."""
+_lastScriptRepeatCount = 0
+
+
+def getLastScriptRepeatCount():
+	return _lastScriptRepeatCount
+
+
+def script(description="", category=None, gesture=None, gestures=None, **kwargs):
+	def decorator(func):
+		func.__doc__ = description
+		func.category = category
+		func.gestures = list(gestures or ()) + ([gesture] if gesture else [])
+		return func
+	return decorator
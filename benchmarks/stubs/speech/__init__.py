@@ -0,0 +1,30 @@
+"""Stand-in for NVDA's speech package."""
+from . import speech
+from .speech import (
+	LANGS_WITH_CONJUNCT_CHARS,
+	cancelSpeech,
+	getCharDescListFromText,
+	getCurrentLanguage,
+	getSpellingSpeech,
+	speak,
+	speakMessage,
+	speakSpelling,
+	speakText,
+	speakTextInfo,
+	spellTextInfo,
+)
+
+__all__ = [
+	"speech",
+	"LANGS_WITH_CONJUNCT_CHARS",
+	"cancelSpeech",
+	"getCharDescListFromText",
+	"getCurrentLanguage",
+	"getSpellingSpeech",
+	"speak",
+	"speakMessage",
+	"speakSpelling",
+	"speakText",
+	"speakTextInfo",
+	"spellTextInfo",
+]
@@ -0,0 +1,51 @@
+"""Stand-in for NVDA's speech.commands module."""
+
+
+class SpeechCommand:
+	def __repr__(self):
+		return f"{type(self).__name__}()"
+
+	def __eq__(self, other):
+		return type(self) is type(other) and vars(self) == vars(other)
+
+
+class EndUtteranceCommand(SpeechCommand):
+	pass
+
+
+class LangChangeCommand(SpeechCommand):
+	def __init__(self, lang):
+		self.lang = lang
+
+	def __repr__(self):
+		return f"LangChangeCommand({self.lang!r})"
+
+
+class PitchCommand(SpeechCommand):
+	def __init__(self, offset=0):
+		self.offset = offset
+
+
+class BeepCommand(SpeechCommand):
+	def __init__(self, hz, length):
+		self.hz = hz
+		self.length = length
+
+
+class CharacterModeCommand(SpeechCommand):
+	def __init__(self, state):
+		self.state = state
+
+
+class CallbackCommand(SpeechCommand):
+	def __init__(self, callback, name=None):
+		self._callback = callback
+		self._name = name
+
+	def run(self):
+		self._callback()
+
+
+class BreakCommand(SpeechCommand):
+	def __init__(self, time=0):
+		self.time = time
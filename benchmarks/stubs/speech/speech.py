@@ -0,0 +1,178 @@
+"""Stand-in for NVDA's speech.speech module.
+Spoken sequences are collected in L{spoken}; callbacks in them run when the sequence is spoken, unless cancelled.
+"""
+from typing import Union
+
+import characterProcessing
+import config
+import synthDriverHandler
+from .commands import (
+	BeepCommand,
+	CallbackCommand,
+	CharacterModeCommand,
+	EndUtteranceCommand,
+	LangChangeCommand,
+	PitchCommand,
+	SpeechCommand,
+)
+
+SequenceItemT = Union[SpeechCommand, str]
+LANGS_WITH_CONJUNCT_CHARS = {"hi", "as", "bn", "gu", "kn", "kok", "ml", "mni", "mr", "pa", "te", "ur", "ta"}
+
+spoken = []
+
+
+class SpeechState:
+	beenCanceled = True
+
+
+_speechState = SpeechState()
+
+
+def getCurrentLanguage():
+	return "zh_TW"
+
+
+def cancelSpeech():
+	_speechState.beenCanceled = True
+
+
+def speak(speechSequence, symbolLevel=None, priority=None):
+	_speechState.beenCanceled = False
+	spoken.append(list(speechSequence))
+	for item in list(speechSequence):
+		if _speechState.beenCanceled:
+			break
+		if isinstance(item, CallbackCommand):
+			item.run()
+
+
+def speakText(text, reason=None, symbolLevel=None, priority=None):
+	speak([text], symbolLevel=symbolLevel, priority=priority)
+
+
+def speakMessage(text, priority=None):
+	speak([text], priority=priority)
+
+
+def getCharDescListFromText(text, locale):
+	textList = []
+	length = len(text)
+	while length > 0:
+		subText = text[:length]
+		desc = characterProcessing.getCharacterDescription(locale, subText)
+		if desc:
+			textList.append((subText, desc))
+			text = text[length:]
+			length = len(text)
+		else:
+			length -= 1
+	return textList
+
+
+def _getSpellingCharAddCapNotification(speakCharAs, sayCapForCapitals, capPitchChange, beepForCapitals):
+	if sayCapForCapitals:
+		yield "cap %s" % speakCharAs
+	else:
+		if capPitchChange:
+			yield PitchCommand(offset=capPitchChange)
+		if beepForCapitals:
+			yield BeepCommand(2000, 50)
+		yield speakCharAs
+		if capPitchChange:
+			yield PitchCommand()
+
+
+def _getSpellingSpeechAddCharMode(seq):
+	charMode = False
+	for item in seq:
+		if isinstance(item, str):
+			if len(item) == 1:
+				if not charMode:
+					yield CharacterModeCommand(True)
+					charMode = True
+			elif charMode:
+				yield CharacterModeCommand(False)
+				charMode = False
+		yield item
+
+
+def _getSpellingSpeechWithoutCharMode(
+		text,
+		locale,
+		useCharacterDescriptions,
+		sayCapForCapitals,
+		capPitchChange,
+		beepForCapitals,
+		fallbackToCharIfNoDescription=True,
+):
+	defaultLanguage = getCurrentLanguage()
+	if not locale or (
+		not config.conf["speech"]["autoDialectSwitching"]
+		and locale.split("_")[0] == defaultLanguage.split("_")[0]
+	):
+		locale = defaultLanguage
+	if not text:
+		yield "blank"
+		return
+	if not text.isspace():
+		text = text.rstrip()
+	textLength = len(text)
+	localeHasConjuncts = locale.split("_", 1)[0] in LANGS_WITH_CONJUNCT_CHARS
+	charDescList = getCharDescListFromText(text, locale) if localeHasConjuncts else text
+	for item in charDescList:
+		if localeHasConjuncts:
+			speakCharAs = item[0]
+			charDesc = item[1]
+		else:
+			charDesc = None
+			speakCharAs = item
+			if useCharacterDescriptions:
+				charDesc = characterProcessing.getCharacterDescription(locale, speakCharAs.lower())
+		uppercase = speakCharAs.isupper()
+		if useCharacterDescriptions and charDesc:
+			speakCharAs = charDesc[0] if textLength > 1 else "、".join(charDesc)
+		else:
+			speakCharAs = characterProcessing.processSpeechSymbol(locale, speakCharAs)
+		if config.conf["speech"]["autoLanguageSwitching"]:
+			yield LangChangeCommand(locale)
+		yield from _getSpellingCharAddCapNotification(
+			speakCharAs,
+			uppercase and sayCapForCapitals,
+			capPitchChange if uppercase else 0,
+			uppercase and beepForCapitals,
+		)
+		yield EndUtteranceCommand()
+
+
+def getSpellingSpeech(text, locale=None, useCharacterDescriptions=False):
+	synth = synthDriverHandler.getSynth()
+	synthConfig = config.conf["speech"][synth.name]
+	if synth.isSupported("pitch"):
+		capPitchChange = synthConfig["capPitchChange"]
+	else:
+		capPitchChange = 0
+	seq = _getSpellingSpeechWithoutCharMode(
+		text,
+		locale,
+		useCharacterDescriptions,
+		sayCapForCapitals=synthConfig["sayCapForCapitals"],
+		capPitchChange=capPitchChange,
+		beepForCapitals=synthConfig["beepForCapitals"],
+	)
+	if synthConfig["useSpellingFunctionality"]:
+		seq = _getSpellingSpeechAddCharMode(seq)
+	yield from seq
+
+
+def speakSpelling(text, locale=None, useCharacterDescriptions=False, priority=None):
+	seq = list(getSpellingSpeech(text, locale=locale, useCharacterDescriptions=useCharacterDescriptions))
+	speak(seq, priority=priority)
+
+
+def spellTextInfo(info, useCharacterDescriptions=False, priority=None):
+	speakSpelling(info.text, useCharacterDescriptions=useCharacterDescriptions, priority=priority)
+
+
+def speakTextInfo(info, unit=None, reason=None, **kwargs):
+	speakText(info.text, reason=reason)
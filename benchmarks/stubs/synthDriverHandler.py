@@ -0,0 +1,19 @@
+"""Stand-in for NVDA's synthDriverHandler module."""
+import extensionPoints
+
+synthChanged = extensionPoints.Action()
+
+
+class SynthDriver:
+	name = "stub"
+	supportedSettings = ("pitch",)
+
+	def isSupported(self, settingName):
+		return settingName in self.supportedSettings
+
+
+_synth = SynthDriver()
+
+
+def getSynth():
+	return _synth
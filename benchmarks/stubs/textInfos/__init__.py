@@ -0,0 +1,10 @@
+"""Stand-in for NVDA's textInfos package."""
+UNIT_CHARACTER = "character"
+UNIT_WORD = "word"
+UNIT_LINE = "line"
+
+
+class FieldCommand:
+	def __init__(self, command, field):
+		self.command = command
+		self.field = field
@@ -0,0 +1,7 @@
+"""Stand-in for NVDA's textInfos.offsets module."""
+from typing import NamedTuple
+
+
+class Offsets(NamedTuple):
+	startOffset: int
+	endOffset: int
@@ -0,0 +1,16 @@
+"""Stand-in for NVDA's textUtils module."""
+WCHAR_ENCODING = "utf_16_le"
+
+
+class WideStringOffsetConverter:
+	def __init__(self, text):
+		self.decoded = text
+		self.strLength = len(text)
+		self.encodedStringLength = len(text.encode(WCHAR_ENCODING)) // 2
+
+	def encodedToStrOffsets(self, encodedStart, encodedEnd=None, raiseOnError=False):
+		def convert(offset):
+			return len(self.decoded.encode(WCHAR_ENCODING)[:offset * 2].decode(WCHAR_ENCODING, "ignore"))
+		if encodedEnd is None:
+			return convert(encodedStart)
+		return convert(encodedStart), convert(encodedEnd)
@@ -0,0 +1,5 @@
+"""Stand-in for NVDA's treeInterceptorHandler module."""
+
+
+class TreeInterceptor:
+	isAlive = True
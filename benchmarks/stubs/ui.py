@@ -0,0 +1,14 @@
+"""Stand-in for NVDA's ui module. Messages are collected in L{messages}."""
+messages = []
+
+
+def message(text, *args, **kwargs):
+	messages.append(text)
+
+
+def reviewMessage(text, *args, **kwargs):
+	messages.append(text)
+
+
+def browseableMessage(text, title=None, isHtml=False):
+	messages.append(text)
@@ -0,0 +1 @@
+"""Stand-in for NVDA's utils package."""
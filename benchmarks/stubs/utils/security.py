@@ -0,0 +1,5 @@
+"""Stand-in for NVDA's utils.security module."""
+
+
+def objectBelowLockScreenAndWindowsIsLocked(obj, *args, **kwargs):
+	return False
@@ -0,0 +1,198 @@
+# buildReadings.py
+# Part of CJKEnhancedUI
+# Builds the reading shards of the add-on from the Unihan database, one file per reading system and Unicode block.
+# Usage: python tools/buildReadings.py Unihan.zip [--output DIRECTORY]
+# The Unihan database is published at https://www.unicode.org/Public/UCD/latest/ucd/Unihan.zip;
+# Unihan_Readings.txt, extracted from it, can be given instead.
+
+import argparse
+import os
+import sys
+from typing import (
+	Dict,
+	Iterable,
+	Iterator,
+	List,
+	Optional,
+	Tuple,
+)
+import unicodedata
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+#Loads the add-on's modules on top of the stand-in NVDA modules.
+import environment  # noqa: E402, F401
+
+from globalPlugins.cjkEnhancedUI import readingIndex  # noqa: E402
+
+#: The Unihan fields readings are taken from, most authoritative first.
+READING_FIELDS = ("kMandarin", "kHanyuPinyin", "kXHC1983")
+
+#: The combining tone marks of decomposed Pinyin and their tones.
+TONE_MARKS = {
+	"\u0304": 1,
+	"\u0301": 2,
+	"\u030C": 3,
+	"\u0300": 4,
+}
+
+ZHUYIN_TONES = {1: "", 2: "ˊ", 3: "ˇ", 4: "ˋ"}
+
+ZHUYIN_INITIALS = {
+	"zh": "ㄓ", "ch": "ㄔ", "sh": "ㄕ",
+	"b": "ㄅ", "p": "ㄆ", "m": "ㄇ", "f": "ㄈ", "d": "ㄉ", "t": "ㄊ", "n": "ㄋ", "l": "ㄌ",
+	"g": "ㄍ", "k": "ㄎ", "h": "ㄏ", "j": "ㄐ", "q": "ㄑ", "x": "ㄒ", "r": "ㄖ", "z": "ㄗ", "c": "ㄘ", "s": "ㄙ",
+}
+
+#: Finals as spelled after an initial, with ü written v.
+ZHUYIN_FINALS = {
+	"": "",
+	"a": "ㄚ", "o": "ㄛ", "e": "ㄜ", "ê": "ㄝ", "ai": "ㄞ", "ei": "ㄟ", "ao": "ㄠ", "ou": "ㄡ",
+	"an": "ㄢ", "en": "ㄣ", "ang": "ㄤ", "eng": "ㄥ", "er": "ㄦ", "ong": "ㄨㄥ",
+	"i": "ㄧ", "ia": "ㄧㄚ", "io": "ㄧㄛ", "ie": "ㄧㄝ", "iai": "ㄧㄞ", "iao": "ㄧㄠ", "iu": "ㄧㄡ", "iou": "ㄧㄡ",
+	"ian": "ㄧㄢ", "in": "ㄧㄣ", "iang": "ㄧㄤ", "ing": "ㄧㄥ", "iong": "ㄩㄥ",
+	"u": "ㄨ", "ua": "ㄨㄚ", "uo": "ㄨㄛ", "uai": "ㄨㄞ", "ui": "ㄨㄟ", "uei": "ㄨㄟ",
+	"uan": "ㄨㄢ", "un": "ㄨㄣ", "uen": "ㄨㄣ", "uang": "ㄨㄤ", "ueng": "ㄨㄥ",
+	"v": "ㄩ", "ve": "ㄩㄝ", "van": "ㄩㄢ", "vn": "ㄩㄣ",
+	"m": "ㄇ", "n": "ㄋ", "ng": "ㄫ",
+}
+
+#: Syllables starting with y or w, spelled as the finals they stand for.
+SEMIVOWEL_FINALS = {
+	"yi": "i", "ya": "ia", "yo": "io", "ye": "ie", "yai": "iai", "yao": "iao", "you": "iou",
+	"yan": "ian", "yin": "in", "yang": "iang", "ying": "ing", "yong": "iong",
+	"yu": "v", "yue": "ve", "yuan": "van", "yun": "vn",
+	"wu": "u", "wa": "ua", "wo": "uo", "wai": "uai", "wei": "uei",
+	"wan": "uan", "wen": "uen", "wang": "uang", "weng": "ueng",
+}
+
+#: Syllables made of an initial alone.
+SYLLABIC_INITIALS = {"zhi", "chi", "shi", "ri", "zi", "ci", "si"}
+
+
+def splitTone(syllable: str) -> Tuple[str, int]:
+	"""
+	@return: a Pinyin syllable without its tone mark, with ü written v and ê kept, and its tone, 5 for the neutral tone.
+	"""
+	tone = 5
+	letters = []
+	for character in unicodedata.normalize("NFD", syllable.lower()):
+		if character in TONE_MARKS:
+			tone = TONE_MARKS[character]
+		elif character == "\u0308":
+			letters[-1] = "v"
+		elif character == "\u0302":
+			letters[-1] = "ê"
+		else:
+			letters.append(character)
+	return "".join(letters), tone
+
+
+def toZhuyin(syllable: str) -> Optional[str]:
+	"""
+	Converts a Pinyin syllable with tone marks to Zhuyin.
+	@return: the Zhuyin syllable, or None if the syllable is not valid Pinyin.
+	"""
+	letters, tone = splitTone(syllable)
+	if letters in SYLLABIC_INITIALS:
+		initial, final = letters[:-1], ""
+	elif letters in SEMIVOWEL_FINALS:
+		initial, final = "", SEMIVOWEL_FINALS[letters]
+	else:
+		initial = next((initial for initial in ZHUYIN_INITIALS if letters.startswith(initial) and letters != initial), "")
+		final = letters[len(initial):]
+		if initial in ("j", "q", "x") and final.startswith("u"):
+			final = "v" + final[1:]
+		if final not in ZHUYIN_FINALS:
+			#Interjections such as ng are syllabic nasals rather than an initial and a final.
+			initial, final = "", letters
+	if final not in ZHUYIN_FINALS or (not initial and not final):
+		return None
+	zhuyin = ZHUYIN_INITIALS.get(initial, "") + ZHUYIN_FINALS[final]
+	if tone == 5:
+		return "˙" + zhuyin
+	return zhuyin + ZHUYIN_TONES[tone]
+
+
+def parseReadings(field: str, value: str) -> List[str]:
+	"""
+	@return: the Pinyin readings of a Unihan field value, in their order of preference.
+	"""
+	if field == "kMandarin":
+		return value.split()
+	readings = []
+	for group in value.split():
+		#kHanyuPinyin and kXHC1983 values are locations followed by the readings found there.
+		readings.extend(group.rpartition(":")[2].split(","))
+	return readings
+
+
+def readUnihan(path: str) -> Iterator[str]:
+	if zipfile.is_zipfile(path):
+		with zipfile.ZipFile(path) as archive:
+			with archive.open("Unihan_Readings.txt") as f:
+				for line in f:
+					yield line.decode("utf-8")
+	else:
+		with open(path, encoding="utf-8") as f:
+			yield from f
+
+
+def collectReadings(lines: Iterable[str]) -> Dict[int, Dict[str, List[str]]]:
+	"""
+	@return: the Pinyin readings of the reading fields of every character, keyed by code point and field.
+	"""
+	fields: Dict[int, Dict[str, List[str]]] = {}
+	for line in lines:
+		if not line.startswith("U+"):
+			continue
+		codePoint, field, value = line.rstrip("\n").split("\t", 2)
+		if field in READING_FIELDS:
+			fields.setdefault(int(codePoint[2:], 16), {})[field] = parseReadings(field, value)
+	return fields
+
+
+def getSystemReadings(fields: Dict[str, List[str]], system: str) -> List[str]:
+	"""
+	@return: the distinct readings of a character in a reading system, in their order of preference.
+	"""
+	readings: List[str] = []
+	for field in READING_FIELDS:
+		values = fields.get(field, [])
+		if field == "kMandarin" and system == "zhuyin":
+			#When kMandarin has two values, the second is the one preferred in Taiwan.
+			values = values[::-1]
+		for value in values:
+			reading = toZhuyin(value) if system == "zhuyin" else value
+			if reading and reading not in readings:
+				readings.append(reading)
+	return readings
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("unihan", help="Unihan.zip or Unihan_Readings.txt")
+	parser.add_argument("--output", default=readingIndex.READINGS_DIRECTORY)
+	args = parser.parse_args()
+	characters = collectReadings(readUnihan(args.unihan))
+	for system in sorted(set(readingIndex.READING_SYSTEMS.values())):
+		os.makedirs(os.path.join(args.output, system), exist_ok=True)
+		for block in readingIndex.BLOCKS:
+			lines = []
+			for codePoint in range(block.first, block.last + 1):
+				readings = getSystemReadings(characters.get(codePoint, {}), system)
+				if readings:
+					lines.append(f"{codePoint:04X}\t{' '.join(readings)}\n")
+			path = os.path.join(args.output, system, f"{block.name}.tsv")
+			if not lines:
+				if os.path.isfile(path):
+					os.remove(path)
+				continue
+			with open(path, "w", encoding="utf-8", newline="\n") as f:
+				f.writelines(lines)
+			print(f"{path}: {len(lines)} characters, {os.path.getsize(path)} bytes")
+
+
+if __name__ == "__main__":
+	main()